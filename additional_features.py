@@ -1,11 +1,16 @@
 from PySide6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel,
                                QLineEdit, QPushButton, QTextEdit, QProgressBar,
-                               QSpinBox, QCheckBox)
+                               QSpinBox, QCheckBox, QListWidget, QListWidgetItem,
+                               QRadioButton, QGroupBox)
 from PySide6.QtCore import Qt, QThread, Signal
 from PySide6.QtGui import QFont, QIcon
+import numpy as np
 import pandas as pd
 import time
 
+from quantile_sketch import column_quantile_sketches
+from distinct_sketch import column_distinct_sketches, standard_error
+
 
 class DataPreviewDialog(QDialog):
 
@@ -58,7 +63,7 @@ class DataPreviewDialog(QDialog):
         summary.append(f"Memory: {self.df.memory_usage(deep=True).sum() / 1024:.2f} KB")
         summary.append(f"Missing Values: {self.df.isnull().sum().sum()}")
         summary.append(f"\nNumeric Columns: {len(self.df.select_dtypes(include=['number']).columns)}")
-        summary.append(f"Categorical Columns: {len(self.df.select_dtypes(include=['object']).columns)}")
+        summary.append(f"Categorical Columns: {len(self.df.select_dtypes(include=['object', 'category']).columns)}")
         return "\n".join(summary)
 
     def update_display(self, filtered_df=None):
@@ -112,6 +117,176 @@ class ExportProgressDialog(QDialog):
             self.detail_text.append(details)
 
 
+class LoadProgressDialog(QDialog):
+
+    cancel_requested = Signal()
+
+    def __init__(self, file_name, parent=None, title=None):
+        super().__init__(parent)
+        self.setWindowTitle(title or f"Loading {file_name}")
+        self.setModal(True)
+        self.setup_ui()
+
+    def setup_ui(self):
+        layout = QVBoxLayout()
+
+        self.status_label = QLabel("Starting...")
+        layout.addWidget(self.status_label)
+
+        self.progress = QProgressBar()
+        self.progress.setRange(0, 100)
+        layout.addWidget(self.progress)
+
+        self.cancel_btn = QPushButton("Cancel")
+        self.cancel_btn.clicked.connect(self.request_cancel)
+        layout.addWidget(self.cancel_btn)
+
+        self.setLayout(layout)
+        self.resize(400, 120)
+
+    def update_progress(self, value, status=""):
+        self.progress.setValue(value)
+        if status:
+            self.status_label.setText(status)
+
+    def request_cancel(self):
+        self.cancel_btn.setEnabled(False)
+        self.status_label.setText("Cancelling...")
+        self.cancel_requested.emit()
+
+    def reject(self):
+        # Closing the window (Esc / title bar) cancels the load, the owner
+        # closes the dialog once the worker has actually stopped
+        if self.cancel_btn.isEnabled():
+            self.request_cancel()
+
+
+class LoadOptionsDialog(QDialog):
+
+    def __init__(self, preview, parent=None, allow_filter=False):
+        super().__init__(parent)
+        self.preview = preview
+        self.allow_filter = allow_filter
+        self.setWindowTitle("Load Options")
+        self.setGeometry(200, 200, 800, 600)
+        self.setup_ui()
+
+    def setup_ui(self):
+        layout = QVBoxLayout()
+
+        # Preview of the first rows
+        layout.addWidget(QLabel(f"Preview (first {len(self.preview)} rows):"))
+        preview_text = QTextEdit()
+        preview_text.setReadOnly(True)
+        preview_text.setFont(QFont("Courier", 9))
+        preview_text.setText(self.preview.head(10).to_string())
+        preview_text.setMaximumHeight(180)
+        layout.addWidget(preview_text)
+
+        # Column projection
+        columns_group = QGroupBox("Columns to load")
+        columns_layout = QVBoxLayout()
+
+        self.column_list = QListWidget()
+        for col in self.preview.columns:
+            item = QListWidgetItem(str(col))
+            item.setFlags(item.flags() | Qt.ItemIsUserCheckable)
+            item.setCheckState(Qt.Checked)
+            self.column_list.addItem(item)
+        columns_layout.addWidget(self.column_list)
+
+        column_buttons = QHBoxLayout()
+        select_all_btn = QPushButton("Select All")
+        select_all_btn.clicked.connect(lambda: self.set_all_columns(Qt.Checked))
+        clear_all_btn = QPushButton("Clear All")
+        clear_all_btn.clicked.connect(lambda: self.set_all_columns(Qt.Unchecked))
+        column_buttons.addWidget(select_all_btn)
+        column_buttons.addWidget(clear_all_btn)
+        columns_layout.addLayout(column_buttons)
+
+        columns_group.setLayout(columns_layout)
+        layout.addWidget(columns_group)
+
+        # Row selection
+        rows_group = QGroupBox("Rows to load")
+        rows_layout = QVBoxLayout()
+
+        self.all_rows_radio = QRadioButton("All rows")
+        self.all_rows_radio.setChecked(True)
+        rows_layout.addWidget(self.all_rows_radio)
+
+        head_layout = QHBoxLayout()
+        self.head_rows_radio = QRadioButton("First N rows:")
+        self.head_rows_spin = QSpinBox()
+        self.head_rows_spin.setRange(1, 2_000_000_000)
+        self.head_rows_spin.setValue(100000)
+        head_layout.addWidget(self.head_rows_radio)
+        head_layout.addWidget(self.head_rows_spin)
+        rows_layout.addLayout(head_layout)
+
+        sample_layout = QHBoxLayout()
+        self.sample_rows_radio = QRadioButton("Random sample of N rows:")
+        self.sample_rows_spin = QSpinBox()
+        self.sample_rows_spin.setRange(1, 2_000_000_000)
+        self.sample_rows_spin.setValue(100000)
+        sample_layout.addWidget(self.sample_rows_radio)
+        sample_layout.addWidget(self.sample_rows_spin)
+        rows_layout.addLayout(sample_layout)
+
+        # Row filter, pushed down into the scan of columnar files
+        self.filter_input = QLineEdit()
+        self.filter_input.setPlaceholderText("e.g. year >= 2024 and region == 'EU'")
+        if self.allow_filter:
+            filter_layout = QHBoxLayout()
+            filter_layout.addWidget(QLabel("Only rows where:"))
+            filter_layout.addWidget(self.filter_input)
+            rows_layout.addLayout(filter_layout)
+
+        rows_group.setLayout(rows_layout)
+        layout.addWidget(rows_group)
+
+        # Buttons
+        btn_layout = QHBoxLayout()
+        load_btn = QPushButton("Load")
+        load_btn.clicked.connect(self.accept)
+        cancel_btn = QPushButton("Cancel")
+        cancel_btn.clicked.connect(self.reject)
+        btn_layout.addWidget(load_btn)
+        btn_layout.addWidget(cancel_btn)
+        layout.addLayout(btn_layout)
+
+        self.setLayout(layout)
+
+    def set_all_columns(self, state):
+        for i in range(self.column_list.count()):
+            self.column_list.item(i).setCheckState(state)
+
+    def selected_columns(self):
+        return [
+            self.column_list.item(i).text()
+            for i in range(self.column_list.count())
+            if self.column_list.item(i).checkState() == Qt.Checked
+        ]
+
+    def get_options(self):
+        options = {}
+
+        columns = self.selected_columns()
+        if len(columns) < self.column_list.count():
+            options['usecols'] = columns
+
+        if self.head_rows_radio.isChecked():
+            options['nrows'] = self.head_rows_spin.value()
+        elif self.sample_rows_radio.isChecked():
+            options['sample_size'] = self.sample_rows_spin.value()
+            options['sample_seed'] = int(time.time())
+
+        if self.allow_filter and self.filter_input.text().strip():
+            options['row_filter'] = self.filter_input.text().strip()
+
+        return options
+
+
 class DataValidationDialog(QDialog):
 
     def __init__(self, columns, parent=None):
@@ -199,10 +374,16 @@ class AnalysisWorker(QThread):
 
 class QuickStatsWidget(QDialog):
 
-    def __init__(self, data, column_name, parent=None):
+    def __init__(self, data, column_name, parent=None, quantile_error=None, distinct=None,
+                 quantile_sketch=None):
         super().__init__(parent)
         self.data = data
         self.column = column_name
+        self.quantile_error = quantile_error
+        # (count, exact) and the quantile sketch are usually the caller's
+        # cached ones, they are only built here when not supplied
+        self.distinct = distinct
+        self.quantile_sketch = quantile_sketch
         self.setWindowTitle(f"Quick Stats: {column_name}")
         self.setup_ui()
 
@@ -232,17 +413,36 @@ class QuickStatsWidget(QDialog):
         stats.append(f"Data Type: {series.dtype}")
         stats.append(f"Count: {series.count()}")
         stats.append(f"Missing: {series.isnull().sum()}")
-        stats.append(f"Unique: {series.nunique()}\n")
+        if self.distinct is None:
+            # An estimate is enough here and needs no hash table of every value
+            sketch = column_distinct_sketches(self.data, [self.column])[self.column]
+            self.distinct = (sketch.estimate(), False)
+        count, exact = self.distinct
+        stats.append(f"Unique: {count}\n" if exact else f"Unique: ~{count} (±{standard_error():.1%})\n")
 
         if pd.api.types.is_numeric_dtype(series):
+            # One sketch answers all three quantiles instead of a sort each
+            if self.quantile_error is not None:
+                if self.quantile_sketch is None:
+                    self.quantile_sketch = column_quantile_sketches(
+                        [self.column],
+                        [series.to_numpy(dtype=np.float64, na_value=np.nan)],
+                        self.quantile_error
+                    )[self.column]
+                q1, median, q3 = self.quantile_sketch.quantiles([0.25, 0.5, 0.75])
+                approx = f" (approx. ±{self.quantile_error:.2%} rank)"
+            else:
+                q1, median, q3 = series.quantile([0.25, 0.5, 0.75])
+                approx = ""
+
             stats.append("--- Numeric Statistics ---")
             stats.append(f"Mean: {series.mean():.4f}")
-            stats.append(f"Median: {series.median():.4f}")
+            stats.append(f"Median: {median:.4f}{approx}")
             stats.append(f"Std Dev: {series.std():.4f}")
             stats.append(f"Min: {series.min():.4f}")
             stats.append(f"Max: {series.max():.4f}")
-            stats.append(f"Q1: {series.quantile(0.25):.4f}")
-            stats.append(f"Q3: {series.quantile(0.75):.4f}")
+            stats.append(f"Q1: {q1:.4f}{approx}")
+            stats.append(f"Q3: {q3:.4f}{approx}")
         else:
             stats.append("--- Category Statistics ---")
             top_values = series.value_counts().head(5)
@@ -0,0 +1,189 @@
+from PySide6.QtWidgets import QHeaderView, QToolTip
+from PySide6.QtCore import Qt, QThread, Signal, QRect, QRectF, QEvent, QTimer
+from PySide6.QtGui import QColor
+import numpy as np
+import pandas as pd
+
+
+PROFILE_BINS = 16
+PROFILE_HEIGHT = 22
+
+
+def column_profile(series, bins=PROFILE_BINS):
+    """Missing ratio and histogram bar heights (0 to 1) of one column"""
+    total = len(series)
+    missing = int(series.isna().sum())
+    numeric = pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series)
+
+    if numeric:
+        values = series.to_numpy(dtype=np.float64, na_value=np.nan)
+        values = values[np.isfinite(values)]
+        counts = np.histogram(values, bins=bins)[0] if len(values) else np.zeros(0)
+    else:
+        # Text and categories show their most frequent values instead
+        counts = series.value_counts(sort=True).to_numpy()[:bins]
+
+    peak = counts.max() if len(counts) else 0
+    return {
+        'missing_ratio': missing / total if total else 0.0,
+        'heights': counts / peak if peak else np.zeros(len(counts)),
+        'numeric': numeric
+    }
+
+
+class ColumnProfileWorker(QThread):
+
+    profiled = Signal(object, dict)
+
+    def __init__(self, jobs):
+        super().__init__()
+        self.jobs = jobs
+
+    def run(self):
+        for key, series in self.jobs:
+            if self.isInterruptionRequested():
+                return
+            try:
+                profile = column_profile(series)
+            except Exception as e:
+                print(f"Error profiling column {key[1]}: {e}")
+                profile = {}
+            self.profiled.emit(key, profile)
+
+
+class ProfileHeaderView(QHeaderView):
+    """Horizontal header drawing a histogram and missing ratio under each column name"""
+
+    def __init__(self, parent=None):
+        super().__init__(Qt.Horizontal, parent)
+        self.setSectionsClickable(True)
+        self.setHighlightSections(True)
+        self.profiles_enabled = True
+
+        # Profiles are keyed by the model's column keys, so an edited column
+        # is profiled again while the others are reused
+        self.profiles = {}
+        self.pending = []
+        self.requested = set()
+        self.worker = None
+
+    def setModel(self, model):
+        if self.model() is not None and hasattr(self.model(), "column_keys"):
+            self.model().modelReset.disconnect(self.prune_profiles)
+        super().setModel(model)
+        if model is not None and hasattr(model, "column_keys"):
+            model.modelReset.connect(self.prune_profiles)
+
+    def set_profiles_enabled(self, enabled):
+        self.profiles_enabled = enabled
+        self.headerDataChanged(Qt.Horizontal, 0, max(self.count() - 1, 0))
+        self.viewport().update()
+
+    def prune_profiles(self):
+        """Forget profiles of earlier datasets"""
+        version = self.model().version
+        self.profiles = {key: value for key, value in self.profiles.items() if key[0] == version}
+        self.pending = [(key, series) for key, series in self.pending if key[0] == version]
+        self.requested = {key for key in self.requested if key[0] == version}
+
+    def profile(self, logical_index):
+        """Cached profile of a column, queueing it for the worker when missing"""
+        model = self.model()
+        if not self.profiles_enabled or not hasattr(model, "column_keys"):
+            return None
+
+        name = model.dataframe.columns[logical_index]
+        key = model.column_key(name)
+        if key in self.profiles:
+            return self.profiles[key]
+
+        if key not in self.requested:
+            self.requested.add(key)
+            self.pending.append((key, model.dataframe[name]))
+            QTimer.singleShot(0, self.start_profiling)
+        return None
+
+    def start_profiling(self):
+        if not self.pending or (self.worker is not None and self.worker.isRunning()):
+            return
+        self.worker = ColumnProfileWorker(self.pending)
+        self.pending = []
+        self.worker.profiled.connect(self.on_profiled)
+        # Columns that scrolled into view meanwhile are picked up next
+        self.worker.finished.connect(self.start_profiling)
+        self.worker.start()
+
+    def on_profiled(self, key, profile):
+        self.profiles[key] = profile
+        self.requested.discard(key)
+        self.viewport().update()
+
+    def stop(self):
+        if self.worker is not None and self.worker.isRunning():
+            self.worker.requestInterruption()
+            self.worker.wait()
+        self.pending = []
+        self.requested.clear()
+
+    def sectionSizeFromContents(self, logical_index):
+        size = super().sectionSizeFromContents(logical_index)
+        if self.profiles_enabled:
+            size.setHeight(size.height() + PROFILE_HEIGHT)
+        return size
+
+    def paintSection(self, painter, rect, logical_index):
+        if not self.profiles_enabled or rect.height() <= PROFILE_HEIGHT:
+            super().paintSection(painter, rect, logical_index)
+            return
+
+        painter.save()
+        super().paintSection(
+            painter,
+            QRect(rect.left(), rect.top(), rect.width(), rect.height() - PROFILE_HEIGHT),
+            logical_index
+        )
+        painter.restore()
+
+        strip = QRect(rect.left(), rect.bottom() - PROFILE_HEIGHT + 1, rect.width(), PROFILE_HEIGHT)
+        painter.fillRect(strip, self.palette().button())
+
+        profile = self.profile(logical_index)
+        if not profile:
+            return
+
+        # Histogram over the strip, the missing ratio as a red line under it
+        bars = strip.adjusted(3, 2, -3, -5)
+        heights = profile['heights']
+        if len(heights) and bars.width() > 0:
+            step = bars.width() / len(heights)
+            color = self.palette().highlight().color()
+            for idx, height in enumerate(heights):
+                bar_height = max(height * bars.height(), 1.0 if height > 0 else 0.0)
+                painter.fillRect(
+                    QRectF(bars.left() + idx * step, bars.bottom() + 1 - bar_height, max(step - 1, 1), bar_height),
+                    color
+                )
+
+        line = QRectF(bars.left(), strip.bottom() - 2, bars.width(), 2)
+        painter.fillRect(line, self.palette().mid())
+        if profile['missing_ratio'] > 0:
+            painter.fillRect(
+                QRectF(line.left(), line.top(), line.width() * profile['missing_ratio'], line.height()),
+                QColor(200, 40, 40)
+            )
+
+    def viewportEvent(self, event):
+        if event.type() == QEvent.ToolTip and self.profiles_enabled:
+            logical_index = self.logicalIndexAt(event.pos())
+            profile = self.profile(logical_index) if logical_index >= 0 else None
+            if profile:
+                kind = "histogram" if profile['numeric'] else "most frequent values"
+                QToolTip.showText(
+                    event.globalPos(),
+                    f"{self.model().headerData(logical_index, Qt.Horizontal)}\n"
+                    f"Missing: {profile['missing_ratio']:.1%}\n"
+                    f"Bars: {kind}",
+                    self
+                )
+                return True
+        return super().viewportEvent(event)
@@ -0,0 +1,175 @@
+from PySide6.QtCore import QThread
+import hashlib
+import json
+import os
+import shutil
+import uuid
+import numpy as np
+import pandas as pd
+
+
+DEFAULT_STORE_ROOT = os.path.join(os.path.expanduser("~"), ".stats_calc", "columns")
+DEFAULT_STORE_MAX_BYTES = 10 * 1024 ** 3
+
+
+def is_storable(series):
+    """Numeric columns that convert losslessly enough to float64"""
+    return pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series)
+
+
+class MappedColumn:
+    """Read-only float64 values of one column plus its validity bitmap"""
+
+    def __init__(self, name, values, validity_bits, null_count):
+        self.name = name
+        self.values = values
+        self.validity_bits = validity_bits
+        self.null_count = null_count
+
+    def __len__(self):
+        return len(self.values)
+
+    @property
+    def validity(self):
+        return np.unpackbits(self.validity_bits, count=len(self.values)).view(bool)
+
+    def non_null(self):
+        """Values without missing entries, a zero-copy view when there are none"""
+        if self.null_count == 0:
+            return self.values
+        return self.values[self.validity]
+
+    def series(self):
+        """The non-null values as a Series sharing the mapped pages"""
+        return pd.Series(self.non_null(), name=self.name, copy=False)
+
+
+class ColumnStore:
+    """Numeric columns of one dataset as memory-mapped files, written on first use"""
+
+    def __init__(self, key=None, store_root=DEFAULT_STORE_ROOT, max_bytes=DEFAULT_STORE_MAX_BYTES):
+        # Without a key the store belongs to this window only (e.g. cleaned data)
+        self.transient = key is None
+        self.key = key or f"transient-{uuid.uuid4().hex}"
+        self.store_root = store_root
+        self.max_bytes = max_bytes
+        self.directory = os.path.join(store_root, self.key)
+        self.columns = {}
+
+        os.makedirs(self.directory, exist_ok=True)
+        # Reopening bumps the directory so eviction is least-recently-used
+        os.utime(self.directory)
+        if not self.transient:
+            self.enforce_limit()
+
+    def _base(self, name):
+        return os.path.join(
+            self.directory,
+            hashlib.sha1(str(name).encode("utf-8")).hexdigest()[:16]
+        )
+
+    def column(self, name, series):
+        """Mapped view of a numeric column, persisting it the first time"""
+        if name in self.columns:
+            return self.columns[name]
+
+        self.persist(name, series)
+        self.columns[name] = self._open(self._base(name))
+        return self.columns[name]
+
+    def cached(self, name):
+        """Mapped view of a column already on disk, None while it is not written"""
+        if name not in self.columns:
+            # Another instance or the writer thread may have written it
+            base = self._base(name)
+            if not os.path.exists(base + ".json"):
+                return None
+            self.columns[name] = self._open(base)
+        return self.columns[name]
+
+    def persist(self, name, series):
+        """Write a column unless it is on disk already, without mapping it"""
+        base = self._base(name)
+        if not os.path.exists(base + ".json"):
+            self._write(base, name, series)
+
+    def _write(self, base, name, series):
+        values = series.to_numpy(dtype=np.float64, na_value=np.nan)
+        valid = ~np.isnan(values)
+
+        # Every writer has its own temporary files, so instances sharing a
+        # store only ever publish complete files
+        temp = f".{os.getpid()}-{uuid.uuid4().hex[:8]}.tmp"
+        try:
+            values.tofile(base + ".values" + temp)
+            np.packbits(valid).tofile(base + ".valid" + temp)
+            os.replace(base + ".values" + temp, base + ".values")
+            os.replace(base + ".valid" + temp, base + ".valid")
+
+            # The manifest goes last so readers never see a half written column
+            with open(base + ".json" + temp, "w") as manifest:
+                json.dump({
+                    'name': str(name),
+                    'rows': len(values),
+                    'null_count': int(len(values) - valid.sum())
+                }, manifest)
+            os.replace(base + ".json" + temp, base + ".json")
+        finally:
+            for suffix in (".values", ".valid", ".json"):
+                if os.path.exists(base + suffix + temp):
+                    os.remove(base + suffix + temp)
+
+    def _open(self, base):
+        with open(base + ".json") as manifest:
+            info = json.load(manifest)
+
+        rows = info['rows']
+        if rows == 0:
+            return MappedColumn(info['name'], np.empty(0), np.empty(0, dtype=np.uint8), 0)
+
+        values = np.memmap(base + ".values", dtype=np.float64, mode="r", shape=(rows,))
+        validity_bits = np.memmap(base + ".valid", dtype=np.uint8, mode="r")
+        return MappedColumn(info['name'], values, validity_bits, info['null_count'])
+
+    def release(self):
+        """Drop the mappings, removing the files of a transient store"""
+        self.columns.clear()
+        if self.transient:
+            shutil.rmtree(self.directory, ignore_errors=True)
+
+    def enforce_limit(self):
+        """Evict least recently used stores until the root fits"""
+        entries = []
+        for name in os.listdir(self.store_root):
+            path = os.path.join(self.store_root, name)
+            if not os.path.isdir(path) or name.startswith("transient-"):
+                continue
+            size = sum(entry.stat().st_size for entry in os.scandir(path) if entry.is_file())
+            entries.append((os.stat(path).st_mtime, size, path))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            if path == self.directory:
+                continue
+            shutil.rmtree(path, ignore_errors=True)
+            total -= size
+
+
+class ColumnStoreWorker(QThread):
+    """Writes columns to a store off the GUI thread, later reads map them"""
+
+    def __init__(self, store, jobs):
+        super().__init__()
+        self.store = store
+        self.jobs = jobs
+
+    def run(self):
+        for name, series in self.jobs:
+            if self.isInterruptionRequested():
+                return
+            try:
+                self.store.persist(name, series)
+            except OSError as e:
+                print(f"Error storing column {name}: {e}")
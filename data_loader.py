@@ -0,0 +1,1042 @@
+from PySide6.QtCore import QThread, Signal
+import pandas as pd
+import bz2
+import glob
+import gzip
+import io
+import itertools
+import operator
+import json
+import numpy as np
+import os
+import queue
+import re
+import threading
+import time
+from concurrent.futures import wait, FIRST_COMPLETED
+from concurrent.futures.process import BrokenProcessPool
+
+from fingerprint import dataset_fingerprint, sources_fingerprint, file_stat
+from process_pool import worker_pool, shutdown_pool
+
+# Parser engines are imported here, on the GUI thread: pandas imports them
+# lazily, and importing modules from a QThread can crash PySide's import hook
+try:
+    import openpyxl
+except ImportError:
+    openpyxl = None
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+    import pyarrow.dataset as pa_ds
+except ImportError:
+    pa = None
+    pa_ds = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+CSV_CHUNK_ROWS = 100000
+
+# Files smaller than this parse quickly enough with the pandas C parser
+ARROW_MIN_BYTES = 16 * 1024 ** 2
+ARROW_BLOCK_BYTES = 4 * 1024 ** 2
+
+CSV_ENGINES = ["auto", "pyarrow", "pandas"]
+
+EXCEL_BLOCK_ROWS = 20000
+
+# Compressed CSV inputs, by extension
+COMPRESSIONS = {".gz": "gzip", ".bz2": "bz2", ".zst": "zstd"}
+DECOMPRESS_BLOCK_BYTES = 1024 ** 2
+DECOMPRESS_QUEUE_BLOCKS = 16
+
+# Rough text size of a compressed CSV relative to the file on disk
+COMPRESSED_SIZE_RATIO = 4
+
+# Columnar inputs read through pyarrow.dataset, by extension
+COLUMNAR_FORMATS = {
+    ".parquet": "parquet",
+    ".pq": "parquet",
+    ".feather": "feather",
+    ".arrow": "ipc",
+    ".ipc": "ipc"
+}
+
+# One condition of a row filter: column, operator, literal
+FILTER_CONDITION = re.compile(
+    r"^\s*(?:`(?P<quoted>[^`]+)`|(?P<name>[A-Za-z_][\w.]*))\s*"
+    r"(?P<op>==|!=|>=|<=|=|>|<)\s*(?P<value>.+?)\s*$"
+)
+FILTER_OPERATORS = {
+    "==": operator.eq,
+    "=": operator.eq,
+    "!=": operator.ne,
+    ">=": operator.ge,
+    "<=": operator.le,
+    ">": operator.gt,
+    "<": operator.lt
+}
+
+# Column added to datasets stitched together from several part files
+SOURCE_FILE_COLUMN = "source_file"
+
+# Multi-file loads check for cancellation this often while parts parse
+CANCEL_POLL_SECONDS = 0.1
+
+# Options that pick how a file is parsed without changing the result
+ENGINE_OPTION_KEYS = {"csv_engine", "full_fingerprint"}
+
+PREVIEW_ROWS = 20
+
+# Text columns with at most this share of distinct values become categoricals
+CATEGORY_MAX_UNIQUE_RATIO = 0.5
+
+
+class LoadCancelled(Exception):
+    """Raised inside a reader when the user cancels the load"""
+
+
+class ChunkCollector:
+    """Accumulates parsed chunks and joins them once the read is done"""
+
+    def __init__(self):
+        self.chunks = []
+        self.rows_seen = 0
+
+    def add(self, chunk):
+        self.chunks.append(chunk)
+        self.rows_seen += len(chunk)
+
+    def result(self):
+        if not self.chunks:
+            return pd.DataFrame()
+        if len(self.chunks) == 1:
+            return self.chunks[0].reset_index(drop=True)
+        return pd.concat(self.chunks, ignore_index=True)
+
+
+class ReservoirSampler:
+    """Uniform random sample of rows drawn from a stream of chunks"""
+
+    def __init__(self, size, seed=None):
+        self.size = size
+        self.rng = np.random.default_rng(seed)
+        self.sample = None
+        self.keys = np.empty(0)
+        self.positions = np.empty(0, dtype=np.int64)
+        self.rows_seen = 0
+
+    def add(self, chunk):
+        # Every row draws a uniform key and the reservoir keeps the rows with
+        # the smallest keys, which is a uniform sample without replacement
+        keys = self.rng.random(len(chunk))
+        positions = np.arange(self.rows_seen, self.rows_seen + len(chunk))
+        self.rows_seen += len(chunk)
+
+        if self.sample is not None and len(self.keys) >= self.size:
+            candidates = keys < self.keys.max()
+            if not candidates.any():
+                return
+            chunk = chunk[candidates]
+            keys = keys[candidates]
+            positions = positions[candidates]
+
+        chunk = chunk.reset_index(drop=True)
+        if self.sample is None:
+            self.sample = chunk
+        else:
+            self.sample = pd.concat([self.sample, chunk], ignore_index=True)
+        self.keys = np.concatenate([self.keys, keys])
+        self.positions = np.concatenate([self.positions, positions])
+
+        if len(self.keys) > self.size:
+            keep = np.argpartition(self.keys, self.size)[:self.size]
+            self.sample = self.sample.iloc[keep].reset_index(drop=True)
+            self.keys = self.keys[keep]
+            self.positions = self.positions[keep]
+
+    def result(self):
+        if self.sample is None:
+            return pd.DataFrame()
+        # Restore the file order of the sampled rows
+        order = np.argsort(self.positions, kind="stable")
+        return self.sample.iloc[order].reset_index(drop=True)
+
+
+def compression_of(file_path):
+    """Compression of a file judging by its extension, or None"""
+    return COMPRESSIONS.get(os.path.splitext(file_path.lower())[1])
+
+
+def is_csv_path(file_path):
+    """True for .csv files, compressed or not"""
+    lower_path = file_path.lower()
+    if compression_of(lower_path):
+        lower_path = os.path.splitext(lower_path)[0]
+    return lower_path.endswith(".csv")
+
+
+def columnar_format_of(file_path):
+    """pyarrow.dataset format name for Parquet / Feather / Arrow IPC files, or None"""
+    return COLUMNAR_FORMATS.get(os.path.splitext(file_path.lower())[1])
+
+
+def _filter_literal(text):
+    if len(text) >= 2 and text[0] == text[-1] and text[0] in "'\"":
+        return text[1:-1]
+    if text.lower() in ("true", "false"):
+        return text.lower() == "true"
+    for convert in (int, float):
+        try:
+            return convert(text)
+        except ValueError:
+            pass
+    raise ValueError(f"Cannot read filter value {text!r}, quote text values")
+
+
+def parse_filter_conditions(text):
+    """Split e.g. "year >= 2024 and region == 'EU'" into (column, operator, value)"""
+    conditions = []
+    for part in re.split(r"\s+and\s+", text.strip(), flags=re.IGNORECASE):
+        match = FILTER_CONDITION.match(part)
+        if not match:
+            raise ValueError(f"Cannot read filter condition {part!r}, expected: column op value")
+
+        conditions.append((
+            match.group("quoted") or match.group("name"),
+            FILTER_OPERATORS[match.group("op")],
+            _filter_literal(match.group("value"))
+        ))
+    return conditions
+
+
+def parse_row_filter(text):
+    """Turn a filter into a pyarrow expression for the dataset scanner"""
+    if pa_ds is None:
+        raise ValueError("Row filters require pyarrow to be installed")
+
+    expression = None
+    for column, compare, value in parse_filter_conditions(text):
+        condition = compare(pa_ds.field(column), value)
+        expression = condition if expression is None else expression & condition
+    return expression
+
+
+def is_supported_path(file_path):
+    """True for every file format read_data_file understands"""
+    return (
+        is_csv_path(file_path)
+        or columnar_format_of(file_path) is not None
+        or file_path.lower().endswith((".xlsx", ".xls"))
+    )
+
+
+def expand_sources(pattern):
+    """Supported files in a directory or matching a glob, in name order"""
+    if os.path.isdir(pattern):
+        paths = [os.path.join(pattern, name) for name in os.listdir(pattern)]
+    else:
+        paths = glob.glob(pattern, recursive=True)
+    return sorted(path for path in paths if os.path.isfile(path) and is_supported_path(path))
+
+
+def sources_base_dir(pattern):
+    """Directory of a folder or glob pattern, up to the first wildcard"""
+    if os.path.isdir(pattern):
+        return pattern
+    head = pattern
+    while glob.has_magic(head):
+        head = os.path.dirname(head)
+    return head or "."
+
+
+def estimated_csv_bytes(file_path):
+    """Approximate size of the CSV text, scaling up compressed files"""
+    size = os.path.getsize(file_path)
+    if compression_of(file_path):
+        return size * COMPRESSED_SIZE_RATIO
+    return size
+
+
+class DecompressingReader(io.RawIOBase):
+    """Readable stream fed by a background thread that decompresses the file"""
+
+    def __init__(self, file_path, compression):
+        super().__init__()
+        if compression == "zstd" and zstandard is None:
+            raise ValueError("Reading .zst files requires the zstandard package")
+
+        self.compression = compression
+        self.compressed_handle = open(file_path, "rb")
+        self.blocks = queue.Queue(maxsize=DECOMPRESS_QUEUE_BLOCKS)
+        self.stopped = threading.Event()
+        self.pending = None
+        self.offset = 0
+        self.finished = False
+        self.error = None
+
+        # gzip, bz2 and zstandard release the GIL while decompressing, so
+        # this overlaps with the parser threads
+        self.thread = threading.Thread(target=self._decompress, daemon=True)
+        self.thread.start()
+
+    @property
+    def compressed_bytes_read(self):
+        return self.compressed_handle.tell()
+
+    def _open_stream(self):
+        if self.compression == "gzip":
+            return gzip.GzipFile(fileobj=self.compressed_handle)
+        if self.compression == "bz2":
+            return bz2.BZ2File(self.compressed_handle)
+        return zstandard.ZstdDecompressor().stream_reader(self.compressed_handle)
+
+    def _decompress(self):
+        try:
+            stream = self._open_stream()
+            while not self.stopped.is_set():
+                block = stream.read(DECOMPRESS_BLOCK_BYTES)
+                if not block:
+                    break
+                self._put(block)
+        except Exception as e:
+            self.error = e
+        finally:
+            self._put(None)
+
+    def _put(self, block):
+        # Give up once the reader is closed instead of blocking on a full queue
+        while not self.stopped.is_set():
+            try:
+                self.blocks.put(block, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        if self.pending is None:
+            if self.finished:
+                return 0
+            block = self.blocks.get()
+            if block is None:
+                self.finished = True
+                if self.error is not None:
+                    raise self.error
+                return 0
+            self.pending = block
+            self.offset = 0
+
+        size = min(len(buffer), len(self.pending) - self.offset)
+        buffer[:size] = self.pending[self.offset:self.offset + size]
+        self.offset += size
+        if self.offset == len(self.pending):
+            self.pending = None
+        return size
+
+    def close(self):
+        if not self.closed:
+            self.stopped.set()
+            self.thread.join()
+            self.compressed_handle.close()
+        super().close()
+
+
+class CsvSource:
+    """Binary stream over a CSV file that tracks how much of it was consumed"""
+
+    def __init__(self, file_path):
+        self.total_bytes = max(os.path.getsize(file_path), 1)
+        compression = compression_of(file_path)
+        if compression:
+            self.raw = DecompressingReader(file_path, compression)
+            self.handle = io.BufferedReader(self.raw, DECOMPRESS_BLOCK_BYTES)
+        else:
+            self.raw = None
+            self.handle = open(file_path, "rb")
+        self.started = time.perf_counter()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.handle.close()
+
+    def consumed(self):
+        """Bytes of the file on disk (compressed bytes for compressed files) read so far"""
+        if self.raw is not None:
+            return min(self.raw.compressed_bytes_read, self.total_bytes)
+        # The parser reads ahead in buffers, so the raw file position is a
+        # good measure of how much of the file has been consumed
+        return min(self.handle.tell(), self.total_bytes)
+
+    def report(self, progress_callback):
+        consumed = self.consumed()
+        throughput = consumed / 1024 ** 2 / max(time.perf_counter() - self.started, 1e-6)
+        unit = "MB compressed" if self.raw is not None else "MB"
+        progress_callback(
+            int(consumed / self.total_bytes * 100),
+            f"Parsed {consumed / 1024 ** 2:.1f} of {self.total_bytes / 1024 ** 2:.1f} "
+            f"{unit} ({throughput:.1f} MB/s)"
+        )
+
+
+class ProgressFile:
+    """Binary file wrapper that reports progress and aborts reads on cancel"""
+
+    def __init__(self, source, progress_callback=None, is_cancelled=None):
+        self.source = source
+        self.progress_callback = progress_callback
+        self.is_cancelled = is_cancelled
+        self.closed = False
+
+    def read(self, size=-1):
+        if self.is_cancelled and self.is_cancelled():
+            raise LoadCancelled()
+
+        block = self.source.handle.read(size)
+
+        if self.progress_callback:
+            self.source.report(self.progress_callback)
+        return block
+
+    def close(self):
+        self.closed = True
+
+
+def choose_csv_engine(file_path, engine="auto"):
+    """Pick the CSV parser to use for a file"""
+    if engine == "auto":
+        if pa is not None and estimated_csv_bytes(file_path) >= ARROW_MIN_BYTES:
+            return "pyarrow"
+        return "pandas"
+
+    if engine == "pyarrow" and pa is None:
+        raise ValueError("The pyarrow engine requires pyarrow to be installed")
+    if engine not in CSV_ENGINES:
+        raise ValueError(f"Unknown CSV engine: {engine}")
+    return engine
+
+
+def _arrow_types_mapper(arrow_type):
+    """Keep Arrow-backed strings, let numeric and temporal columns become NumPy"""
+    if pa.types.is_string(arrow_type) or pa.types.is_large_string(arrow_type):
+        return pd.StringDtype("pyarrow")
+    return None
+
+
+def read_csv_arrow(file_path, progress_callback=None, is_cancelled=None, usecols=None):
+    """Read a CSV file with the multithreaded PyArrow parser"""
+    with CsvSource(file_path) as source:
+        table = pa_csv.read_csv(
+            ProgressFile(source, progress_callback, is_cancelled),
+            read_options=pa_csv.ReadOptions(
+                use_threads=True,
+                block_size=ARROW_BLOCK_BYTES
+            ),
+            convert_options=pa_csv.ConvertOptions(include_columns=usecols)
+        )
+
+    if is_cancelled and is_cancelled():
+        raise LoadCancelled()
+
+    return table.to_pandas(
+        types_mapper=_arrow_types_mapper,
+        split_blocks=True,
+        self_destruct=True
+    )
+
+
+def read_columnar_file(file_path, progress_callback=None, is_cancelled=None, usecols=None,
+                       row_filter=None, nrows=None, collector=None):
+    """Read a Parquet / Feather / Arrow IPC file, pushing columns and filter into the scan"""
+    if pa_ds is None:
+        raise ValueError("Reading Parquet, Feather and Arrow files requires pyarrow")
+
+    dataset = pa_ds.dataset(file_path, format=columnar_format_of(file_path))
+    # Row counts come from the file metadata, nothing is decoded yet
+    total_rows = max(dataset.count_rows(), 1)
+
+    # Parquet row groups whose statistics rule out the filter are skipped
+    # and only the selected columns are decoded
+    scanner = dataset.scanner(
+        columns=usecols,
+        filter=parse_row_filter(row_filter) if row_filter else None,
+        use_threads=True
+    )
+
+    batches = []
+    rows = 0
+    for batch in scanner.to_batches():
+        if is_cancelled and is_cancelled():
+            raise LoadCancelled()
+
+        if nrows:
+            batch = batch.slice(0, nrows - rows)
+        rows += batch.num_rows
+
+        # Samples are drawn batch by batch, everything else converts once
+        if collector is not None:
+            collector.add(batch.to_pandas(types_mapper=_arrow_types_mapper))
+        else:
+            batches.append(batch)
+
+        if progress_callback:
+            progress_callback(
+                min(int(rows / total_rows * 100), 99),
+                f"Read {rows:,} of at most {total_rows:,} rows"
+            )
+
+        if nrows and rows >= nrows:
+            break
+
+    if collector is not None and collector.rows_seen:
+        return collector.result()
+
+    table = pa.Table.from_batches(batches, schema=scanner.projected_schema)
+    return table.to_pandas(
+        types_mapper=_arrow_types_mapper,
+        split_blocks=True,
+        self_destruct=True
+    )
+
+
+def read_csv_file(file_path, progress_callback=None, is_cancelled=None, usecols=None,
+                  nrows=None, collector=None):
+    """Read a CSV file chunk by chunk, reporting the bytes consumed so far"""
+    collector = collector or ChunkCollector()
+
+    with CsvSource(file_path) as source:
+        reader = pd.read_csv(source.handle, chunksize=CSV_CHUNK_ROWS, usecols=usecols, nrows=nrows)
+        for chunk in reader:
+            if is_cancelled and is_cancelled():
+                raise LoadCancelled()
+
+            collector.add(chunk)
+
+            if progress_callback:
+                source.report(progress_callback)
+
+    if not collector.rows_seen:
+        return pd.read_csv(file_path, usecols=usecols, nrows=0)
+    return collector.result()
+
+
+def list_excel_sheets(file_path):
+    """Sheet names of a workbook, read without loading any cells"""
+    if file_path.lower().endswith(".xlsx") and openpyxl is not None:
+        workbook = openpyxl.load_workbook(file_path, read_only=True)
+        try:
+            return list(workbook.sheetnames)
+        finally:
+            workbook.close()
+    return pd.ExcelFile(file_path).sheet_names
+
+
+def _excel_header(header_row):
+    """Column names for a header row, matching pandas' defaults"""
+    names = []
+    seen = {}
+    for idx, value in enumerate(header_row):
+        name = f"Unnamed: {idx}" if value is None else str(value)
+        if name in seen:
+            seen[name] += 1
+            name = f"{name}.{seen[name]}"
+        else:
+            seen[name] = 0
+        names.append(name)
+    return names
+
+
+def _excel_block_frame(rows, columns):
+    """Build a DataFrame from a block of raw worksheet rows"""
+    width = len(columns)
+    rows = [
+        row[:width] if len(row) >= width else row + (None,) * (width - len(row))
+        for row in rows
+    ]
+    frame = pd.DataFrame.from_records(rows, columns=columns)
+    # Blank worksheet rows are skipped, as pd.read_excel does
+    return frame.dropna(how="all").infer_objects()
+
+
+def read_excel_sheet(workbook, sheet, collector, nrows=None, usecols=None, sheet_label=None,
+                     progress_callback=None, is_cancelled=None):
+    """Stream one worksheet into a collector in blocks of rows"""
+    worksheet = workbook[sheet]
+    total_rows = worksheet.max_row or 0
+    rows = worksheet.iter_rows(values_only=True)
+
+    header_row = next(rows, None)
+    if header_row is None:
+        return
+    columns = _excel_header(header_row)
+
+    def add_block(block):
+        frame = _excel_block_frame(block, columns)
+        if usecols:
+            frame = frame[[col for col in columns if col in usecols]]
+        if sheet_label is not None:
+            frame["sheet"] = sheet_label
+        collector.add(frame)
+
+    block = []
+    rows_read = 0
+    for row in rows:
+        block.append(row)
+        rows_read += 1
+
+        if nrows is not None and rows_read >= nrows:
+            break
+
+        if len(block) >= EXCEL_BLOCK_ROWS:
+            if is_cancelled and is_cancelled():
+                raise LoadCancelled()
+            add_block(block)
+            block = []
+
+            if progress_callback and total_rows:
+                progress_callback(
+                    min(int(rows_read / total_rows * 100), 100),
+                    f"Sheet '{sheet}': read {rows_read:,} of ~{total_rows:,} rows"
+                )
+
+    if block or rows_read == 0:
+        add_block(block)
+
+
+def read_excel_file(file_path, progress_callback=None, is_cancelled=None, sheets=None, nrows=None,
+                    usecols=None, collector=None):
+    """Read one or more sheets of an Excel workbook"""
+    if progress_callback:
+        progress_callback(0, "Parsing workbook...")
+
+    collector = collector or ChunkCollector()
+
+    # .xlsx files are streamed through openpyxl's read-only mode so the
+    # workbook object model is never held in memory; several sheets are
+    # stacked with a 'sheet' column naming their origin
+    if file_path.lower().endswith(".xlsx") and openpyxl is not None:
+        workbook = openpyxl.load_workbook(file_path, read_only=True, data_only=True)
+        try:
+            sheet_names = sheets or [workbook.sheetnames[0]]
+            for sheet in sheet_names:
+                read_excel_sheet(
+                    workbook,
+                    sheet,
+                    collector,
+                    nrows=nrows,
+                    usecols=usecols,
+                    sheet_label=sheet if len(sheet_names) > 1 else None,
+                    progress_callback=progress_callback,
+                    is_cancelled=is_cancelled
+                )
+        finally:
+            workbook.close()
+    else:
+        sheet_names = sheets or [0]
+        frames = pd.read_excel(file_path, sheet_name=sheet_names, nrows=nrows, usecols=usecols)
+        for sheet, frame in frames.items():
+            if len(sheet_names) > 1:
+                frame["sheet"] = str(sheet)
+            collector.add(frame)
+
+    if is_cancelled and is_cancelled():
+        raise LoadCancelled()
+    if progress_callback:
+        progress_callback(100, "Workbook parsed")
+
+    data = collector.result()
+    if "sheet" in data.columns and len(sheet_names) > 1:
+        data["sheet"] = data["sheet"].astype("category")
+    return data
+
+
+def _optimize_series(series, category_ratio):
+    """Smallest lossless dtype for a column, or the column unchanged"""
+    if pd.api.types.is_bool_dtype(series) or isinstance(series.dtype, pd.CategoricalDtype):
+        return series
+
+    if pd.api.types.is_integer_dtype(series) and isinstance(series.dtype, np.dtype):
+        if len(series) and series.min() >= 0:
+            return pd.to_numeric(series, downcast="unsigned")
+        return pd.to_numeric(series, downcast="integer")
+
+    if pd.api.types.is_float_dtype(series) and isinstance(series.dtype, np.dtype):
+        values = series.to_numpy()
+        if values.dtype.itemsize > 4:
+            narrowed = values.astype(np.float32)
+            # Only narrow when every value survives the round trip exactly
+            if np.array_equal(narrowed.astype(values.dtype), values, equal_nan=True):
+                return pd.Series(narrowed, index=series.index, name=series.name)
+        return series
+
+    if pd.api.types.is_object_dtype(series) or pd.api.types.is_string_dtype(series):
+        non_null = series.count()
+        if non_null and series.nunique(dropna=True) / non_null <= category_ratio:
+            return series.astype("category")
+
+    return series
+
+
+def optimize_dtypes(dataframe, category_ratio=CATEGORY_MAX_UNIQUE_RATIO):
+    """Downcast numeric columns and encode repetitive text as categoricals"""
+    # Columns are swapped in place one at a time so peak memory stays close
+    # to the size of the frame; the report lists before/after per column
+    report = []
+    for col in dataframe.columns:
+        series = dataframe[col]
+        before_bytes = series.memory_usage(index=False, deep=True)
+        optimized = _optimize_series(series, category_ratio)
+        after_bytes = optimized.memory_usage(index=False, deep=True)
+
+        if optimized is not series and after_bytes < before_bytes:
+            dataframe[col] = optimized
+        else:
+            optimized = series
+            after_bytes = before_bytes
+
+        report.append({
+            'column': col,
+            'before_dtype': str(series.dtype),
+            'after_dtype': str(optimized.dtype),
+            'before_bytes': int(before_bytes),
+            'after_bytes': int(after_bytes)
+        })
+    return report
+
+
+def snapshot_variant(options):
+    """The load options that change the parsed result, as a stable string"""
+    content_options = {
+        key: value for key, value in (options or {}).items()
+        if key not in ENGINE_OPTION_KEYS
+    }
+    return json.dumps(content_options, sort_keys=True, default=str)
+
+
+def load_provenance(options, rows_scanned=None):
+    """How a load was projected and sampled, for the datasets table"""
+    options = options or {}
+    projection = options.get("usecols")
+
+    sampling = None
+    if options.get("sample_size"):
+        sampling = {
+            'method': 'reservoir',
+            'sample_size': options["sample_size"],
+            'seed': options.get("sample_seed"),
+            'rows_scanned': rows_scanned
+        }
+    elif options.get("nrows"):
+        sampling = {
+            'method': 'head',
+            'nrows': options["nrows"]
+        }
+
+    if options.get("row_filter"):
+        sampling = sampling or {'method': 'filter'}
+        sampling['row_filter'] = options["row_filter"]
+    return projection, sampling
+
+
+def read_preview(file_path, options=None, nrows=PREVIEW_ROWS):
+    """Read only the header and the first few rows of a file"""
+    options = dict(options or {})
+    for key in ("usecols", "sample_size", "sample_seed", "row_filter"):
+        options.pop(key, None)
+    options["nrows"] = nrows
+    options["csv_engine"] = "pandas"
+    data, _, _ = read_data_file(file_path, options)
+    return data
+
+
+def read_data_file(file_path, options=None, progress_callback=None, is_cancelled=None):
+    """Read a supported data file, returns (DataFrame, engine name, rows scanned)"""
+    options = options or {}
+    usecols = options.get("usecols")
+    nrows = options.get("nrows")
+
+    if options.get("sample_size"):
+        collector = ReservoirSampler(options["sample_size"], options.get("sample_seed"))
+    else:
+        collector = ChunkCollector()
+
+    lower_path = file_path.lower()
+    if is_csv_path(file_path):
+        engine = choose_csv_engine(file_path, options.get("csv_engine", "auto"))
+        # Head and sampled reads stream through the chunked pandas reader
+        if engine == "pyarrow" and not nrows and not options.get("sample_size"):
+            data = read_csv_arrow(file_path, progress_callback, is_cancelled, usecols=usecols)
+            return data, engine, len(data)
+
+        data = read_csv_file(
+            file_path,
+            progress_callback,
+            is_cancelled,
+            usecols=usecols,
+            nrows=nrows,
+            collector=collector
+        )
+        return data, "pandas", collector.rows_seen
+    elif columnar_format_of(file_path):
+        sampler = collector if options.get("sample_size") else None
+        data = read_columnar_file(
+            file_path,
+            progress_callback,
+            is_cancelled,
+            usecols=usecols,
+            row_filter=options.get("row_filter"),
+            nrows=nrows,
+            collector=sampler
+        )
+        return data, "arrow-dataset", sampler.rows_seen if sampler else len(data)
+    elif lower_path.endswith((".xlsx", ".xls")):
+        data = read_excel_file(
+            file_path,
+            progress_callback,
+            is_cancelled,
+            sheets=options.get("sheets"),
+            nrows=nrows,
+            usecols=usecols,
+            collector=collector
+        )
+        return data, "excel", collector.rows_seen
+    raise ValueError("Unsupported file format")
+
+
+def _read_part(file_path, options):
+    """Parse one part file in a worker process"""
+    data, _, _ = read_data_file(file_path, options)
+    return data
+
+
+def read_sources(pattern, file_paths, options=None, max_workers=None, pool=None,
+                 progress_callback=None, is_cancelled=None):
+    """Parse part files in parallel processes and stack them with a source column"""
+    options = options or {}
+    base_dir = sources_base_dir(pattern)
+    max_workers = max_workers or os.cpu_count()
+    # Spawned workers do not inherit the Qt threads of this process
+    pool = pool or worker_pool(max_workers)
+
+    # No more parts are queued than there are workers, so a cancelled load
+    # drops the queued ones and leaves at most one part per worker running
+    parts = [None] * len(file_paths)
+    pending = iter(enumerate(file_paths))
+    futures = {}
+    for idx, path in itertools.islice(pending, min(max_workers, len(file_paths))):
+        futures[pool.submit(_read_part, path, options)] = idx
+
+    done = 0
+    try:
+        while futures:
+            # Short waits keep cancelling responsive while large parts parse
+            finished, _ = wait(futures, timeout=CANCEL_POLL_SECONDS, return_when=FIRST_COMPLETED)
+            if is_cancelled and is_cancelled():
+                raise LoadCancelled()
+
+            for future in finished:
+                parts[futures.pop(future)] = future.result()
+                for idx, path in itertools.islice(pending, 1):
+                    futures[pool.submit(_read_part, path, options)] = idx
+
+                done += 1
+                if progress_callback:
+                    progress_callback(
+                        int(done / len(file_paths) * 100),
+                        f"Parsed {done} of {len(file_paths)} files"
+                    )
+    except BrokenProcessPool:
+        # A crashed worker breaks the pool, the next load starts a new one
+        shutdown_pool()
+        raise
+    finally:
+        # Running parts finish in the background, their results are dropped
+        for future in futures:
+            future.cancel()
+
+    data = pd.concat(parts, ignore_index=True) if parts else pd.DataFrame()
+
+    names = [os.path.relpath(path, base_dir) for path in file_paths]
+    column = SOURCE_FILE_COLUMN
+    while column in data.columns:
+        column = f"_{column}"
+    data[column] = pd.Categorical.from_codes(
+        np.repeat(np.arange(len(parts)), [len(part) for part in parts]),
+        categories=names
+    )
+    return data
+
+
+class MultiFileLoadWorker(QThread):
+
+    progress = Signal(int, str)
+    loaded = Signal(dict)
+    error = Signal(str)
+    cancelled = Signal()
+
+    def __init__(self, pattern, file_paths, options=None, max_workers=None):
+        super().__init__()
+        self.pattern = pattern
+        self.file_paths = file_paths
+        self.options = options or {}
+        self.max_workers = max_workers or os.cpu_count()
+        # Started here, on the thread creating the worker, see worker_pool
+        self.pool = worker_pool(self.max_workers)
+
+    def cancel(self):
+        self.requestInterruption()
+
+    def run(self):
+        try:
+            start = time.perf_counter()
+
+            data = read_sources(
+                self.pattern,
+                self.file_paths,
+                self.options,
+                max_workers=self.max_workers,
+                pool=self.pool,
+                progress_callback=self.progress.emit,
+                is_cancelled=self.isInterruptionRequested
+            )
+
+            memory_report = None
+            if self.options.get("optimize_dtypes"):
+                self.progress.emit(100, "Optimizing column types...")
+                memory_report = optimize_dtypes(data)
+
+            self.progress.emit(100, "Fingerprinting content...")
+            fingerprint = sources_fingerprint(
+                self.file_paths,
+                snapshot_variant(self.options),
+                full=self.options.get("full_fingerprint", False)
+            )
+
+            base_name = os.path.basename(os.path.normpath(sources_base_dir(self.pattern)))
+            self.loaded.emit({
+                'data': data,
+                'file_path': self.pattern,
+                'file_name': f"{base_name or 'parts'}_{len(self.file_paths)}_files",
+                'parts': self.file_paths,
+                'input_bytes': sum(os.path.getsize(path) for path in self.file_paths),
+                'engine': f"multi-file ({len(self.file_paths)} parts)",
+                'snapshot_key': None,
+                'fingerprint': fingerprint,
+                'stat': file_stat(self.file_paths),
+                'memory_report': memory_report,
+                'rows_scanned': None,
+                'options': self.options,
+                'elapsed': time.perf_counter() - start
+            })
+
+        except LoadCancelled:
+            self.cancelled.emit()
+        except MemoryError:
+            self.error.emit(
+                "Not enough memory to load these files. Select fewer files or columns."
+            )
+        except Exception as e:
+            self.error.emit(str(e))
+
+
+class FileLoadWorker(QThread):
+
+    progress = Signal(int, str)
+    loaded = Signal(dict)
+    error = Signal(str)
+    cancelled = Signal()
+
+    def __init__(self, file_path, options=None, snapshot_cache=None):
+        super().__init__()
+        self.file_path = file_path
+        self.options = options or {}
+        self.snapshot_cache = snapshot_cache
+
+    def cancel(self):
+        self.requestInterruption()
+
+    def run(self):
+        try:
+            start = time.perf_counter()
+
+            snapshot_key = None
+            data = None
+            engine = None
+            memory_report = None
+            rows_scanned = None
+            # Head reads are cheap and samples use a fresh seed, so only full
+            # reads are worth a snapshot
+            partial = self.options.get("nrows") or self.options.get("sample_size")
+            if self.snapshot_cache is not None and self.snapshot_cache.enabled and not partial:
+                snapshot_key = self.snapshot_cache.cache_key(
+                    self.file_path,
+                    snapshot_variant(self.options)
+                )
+                self.progress.emit(0, "Checking snapshot cache...")
+                data = self.snapshot_cache.load(snapshot_key)
+                if data is not None:
+                    engine = "snapshot"
+                    self.progress.emit(100, "Loaded from snapshot cache")
+
+            if data is None:
+                data, engine, rows_scanned = read_data_file(
+                    self.file_path,
+                    self.options,
+                    progress_callback=self.progress.emit,
+                    is_cancelled=self.isInterruptionRequested
+                )
+
+                if self.options.get("optimize_dtypes"):
+                    self.progress.emit(100, "Optimizing column types...")
+                    memory_report = optimize_dtypes(data)
+
+                if snapshot_key is not None:
+                    self.progress.emit(100, "Writing snapshot for faster reopening...")
+                    if not self.snapshot_cache.store(snapshot_key, data):
+                        snapshot_key = None
+
+            self.progress.emit(100, "Fingerprinting content...")
+            fingerprint = dataset_fingerprint(
+                self.file_path,
+                snapshot_variant(self.options),
+                full=self.options.get("full_fingerprint", False)
+            )
+
+            self.loaded.emit({
+                'data': data,
+                'file_path': self.file_path,
+                'engine': engine,
+                'snapshot_key': snapshot_key,
+                'fingerprint': fingerprint,
+                'stat': file_stat([self.file_path]),
+                'memory_report': memory_report,
+                'rows_scanned': rows_scanned,
+                'options': self.options,
+                'elapsed': time.perf_counter() - start
+            })
+
+        except LoadCancelled:
+            self.cancelled.emit()
+        except MemoryError:
+            # Only CSV files are opened out-of-core when they exceed the budget
+            if is_csv_path(self.file_path):
+                self.error.emit(
+                    "Not enough memory to load this file. Lower the memory budget "
+                    "(File > Memory Budget...) to open it out-of-core, or load a sample."
+                )
+            else:
+                self.error.emit(
+                    "Not enough memory to load this file. Load a subset of columns or rows "
+                    "with File > Open with Options..."
+                )
+        except Exception as e:
+            self.error.emit(str(e))
@@ -1,6 +1,8 @@
 import sqlite3
 import json
 
+from fingerprint import exact_fingerprint
+
 
 class DatabaseManager:
     def __init__(self, db_path="stats_calc.db"):
@@ -51,19 +53,109 @@ class DatabaseManager:
         ''')
         self.connection.commit()
 
-    def register_dataset(self, filename, filepath, dataframe):
-        """Save dataset metadata when file is loaded"""
+        self.add_missing_columns('datasets', {
+            'snapshot_key': 'TEXT',
+            'projection': 'TEXT',
+            'sampling': 'TEXT',
+            'content_fingerprint': 'TEXT',
+            'file_size': 'INTEGER',
+            'file_mtime': 'REAL'
+        })
+
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_datasets_fingerprint
+            ON datasets (content_fingerprint)
+        ''')
+        self.connection.commit()
+
+    def add_missing_columns(self, table, columns):
+        """Add columns introduced after a database file was first created"""
+        cursor = self.connection.cursor()
+        cursor.execute(f'PRAGMA table_info({table})')
+        existing = {row[1] for row in cursor.fetchall()}
+
+        for name, column_type in columns.items():
+            if name not in existing:
+                cursor.execute(f'ALTER TABLE {table} ADD COLUMN {name} {column_type}')
+        self.connection.commit()
+
+    def find_dataset(self, fingerprint, dataframe, stat=None):
+        """dataset_id of the first dataset registered with this content, or None
+
+        The shape has to match as well. Sampled fingerprints can miss edits
+        that keep the file size, so they only match a dataset read from a
+        file of the same size and modification time.
+        """
+        try:
+            cursor = self.connection.cursor()
+            cursor.execute('''
+                SELECT dataset_id, file_size, file_mtime FROM datasets
+                WHERE content_fingerprint = ? AND row_count = ? AND columns_names = ?
+                ORDER BY dataset_id
+            ''', (fingerprint, len(dataframe), json.dumps(dataframe.columns.tolist())))
+
+            for dataset_id, file_size, file_mtime in cursor.fetchall():
+                if exact_fingerprint(fingerprint) or (stat is not None and (file_size, file_mtime) == tuple(stat)):
+                    return dataset_id
+            return None
+        except sqlite3.Error as e:
+            print(f"Error looking up dataset: {e}")
+            return None
+
+    def get_dataset_source(self, dataset_id):
+        """(content fingerprint, (file size, modification time) or None) of a dataset"""
+        try:
+            cursor = self.connection.cursor()
+            cursor.execute('''
+                SELECT content_fingerprint, file_size, file_mtime FROM datasets
+                WHERE dataset_id = ?
+            ''', (dataset_id,))
+            result = cursor.fetchone()
+            if result is None:
+                return None, None
+            fingerprint, file_size, file_mtime = result
+            return fingerprint, (file_size, file_mtime) if file_size is not None else None
+        except sqlite3.Error as e:
+            print(f"Error retrieving dataset source: {e}")
+            return None, None
+
+    def register_dataset(self, filename, filepath, dataframe, snapshot_key=None,
+                         projection=None, sampling=None, fingerprint=None, stat=None):
+        """Save dataset metadata when file is loaded, reusing rows with identical content
+
+        stat is the (size, modification time) of the source files, see find_dataset.
+        """
         try:
             cursor = self.connection.cursor()
+
+            if fingerprint is not None:
+                existing_id = self.find_dataset(fingerprint, dataframe, stat)
+                if existing_id is not None:
+                    if snapshot_key is not None:
+                        cursor.execute(
+                            'UPDATE datasets SET snapshot_key = ? WHERE dataset_id = ?',
+                            (snapshot_key, existing_id)
+                        )
+                        self.connection.commit()
+                    return existing_id
+
             cursor.execute('''
-                INSERT INTO datasets (filename, file_path, row_count, column_count, columns_names)
-                VALUES (?, ?, ?, ?, ?)
+                INSERT INTO datasets (filename, file_path, row_count, column_count, columns_names,
+                                      snapshot_key, projection, sampling, content_fingerprint,
+                                      file_size, file_mtime)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
             ''', (
                 filename,
                 filepath,
                 len(dataframe),
                 len(dataframe.columns),
-                json.dumps(dataframe.columns.tolist())
+                json.dumps(dataframe.columns.tolist()),
+                snapshot_key,
+                json.dumps(projection) if projection is not None else None,
+                json.dumps(sampling) if sampling is not None else None,
+                fingerprint,
+                stat[0] if stat is not None else None,
+                stat[1] if stat is not None else None
             ))
             self.connection.commit()
             return cursor.lastrowid
@@ -84,8 +176,8 @@ class DatabaseManager:
             return obj.tolist()
         return obj
 
-    def save_analysis(self, dataset_id, analysis_name, calculations, results):
-        """Save analysis results to database"""
+    def save_analysis(self, dataset_id, analysis_name, calculations, results, sketches=None):
+        """Save analysis results to database, with optional {column: {sketch: value}} accumulators"""
         try:
             cursor = self.connection.cursor()
 
@@ -126,6 +218,15 @@ class DatabaseManager:
                         VALUES (?, ?, ?, ?)
                     ''', (analysis_id, 'overall', key, float(value)))
 
+            # Accumulators go with the results but stay out of the summary
+            for column_name, values in self._convert_to_serializable(sketches or {}).items():
+                for calc_type, calc_value in values.items():
+                    cursor.execute('''
+                        INSERT INTO calculation_results
+                        (analysis_id, column_name, calculation_type, result_value)
+                        VALUES (?, ?, ?, ?)
+                    ''', (analysis_id, column_name, calc_type, float(calc_value)))
+
             self.connection.commit()
             return analysis_id
 
@@ -138,6 +239,27 @@ class DatabaseManager:
             self.connection.rollback()
             return None
 
+    def get_latest_results(self, dataset_id, calculations):
+        """Most recent stored value per (column, calculation) for a dataset"""
+        try:
+            cursor = self.connection.cursor()
+            placeholders = ", ".join("?" for _ in calculations)
+            cursor.execute(f'''
+                SELECT cr.column_name, cr.calculation_type, cr.result_value
+                FROM calculation_results cr
+                JOIN analysis_history ah ON cr.analysis_id = ah.analysis_id
+                WHERE ah.dataset_id = ? AND cr.calculation_type IN ({placeholders})
+                ORDER BY cr.analysis_id DESC
+            ''', (dataset_id, *calculations))
+
+            results = {}
+            for column_name, calculation_type, result_value in cursor.fetchall():
+                results.setdefault(column_name, {}).setdefault(calculation_type, result_value)
+            return results
+        except sqlite3.Error as e:
+            print(f"Error retrieving stored results: {e}")
+            return {}
+
     def get_analysis_history(self, limit=50):
         """Retrieve recent analyses"""
         try:
@@ -187,7 +309,7 @@ class DatabaseManager:
             cursor.execute('''
                 SELECT column_name, calculation_type, result_value
                 FROM calculation_results
-                WHERE analysis_id = ?
+                WHERE analysis_id = ? AND calculation_type NOT LIKE 'sketch:%'
             ''', (analysis_id,))
             calc_results = cursor.fetchall()
 
@@ -286,7 +408,7 @@ class DatabaseManager:
             cursor.execute('''
                 SELECT column_name, calculation_type, result_value
                 FROM calculation_results
-                WHERE analysis_id = ?
+                WHERE analysis_id = ? AND calculation_type NOT LIKE 'sketch:%'
             ''', (analysis_id,))
             calc_results = cursor.fetchall()
 
@@ -0,0 +1,86 @@
+import hashlib
+import os
+
+
+# Sampled fingerprints hash this many evenly spaced blocks of the file
+SAMPLE_BLOCKS = 32
+SAMPLE_BLOCK_BYTES = 64 * 1024
+FULL_READ_BYTES = 1024 ** 2
+
+
+def file_fingerprint(file_path, full=False):
+    """Hash of a file's size and content, sampling blocks unless full is set"""
+    size = os.path.getsize(file_path)
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(str(size).encode("utf-8"))
+
+    # Small files are cheap enough to hash completely either way
+    full = full or size <= SAMPLE_BLOCKS * SAMPLE_BLOCK_BYTES
+
+    with open(file_path, "rb") as handle:
+        if full:
+            for block in iter(lambda: handle.read(FULL_READ_BYTES), b""):
+                digest.update(block)
+        else:
+            # First and last blocks are always included, edits to headers
+            # and appended rows are the most common changes
+            step = (size - SAMPLE_BLOCK_BYTES) / (SAMPLE_BLOCKS - 1)
+            for idx in range(SAMPLE_BLOCKS):
+                handle.seek(int(idx * step))
+                digest.update(handle.read(SAMPLE_BLOCK_BYTES))
+
+    return f"{'full' if full else 'sampled'}:{digest.hexdigest()}"
+
+
+def dataset_fingerprint(file_path, variant="", full=False):
+    """Fingerprint of the dataset a file loads into under the given load options"""
+    digest = hashlib.blake2b(digest_size=16)
+    fingerprint = file_fingerprint(file_path, full)
+    digest.update(fingerprint.encode("utf-8"))
+    digest.update(variant.encode("utf-8"))
+    return f"file:{fingerprint.split(':')[0]}:{digest.hexdigest()}"
+
+
+def sources_fingerprint(file_paths, variant="", full=False):
+    """Fingerprint of a dataset stitched together from several files"""
+    digest = hashlib.blake2b(digest_size=16)
+    kinds = set()
+    for file_path in file_paths:
+        fingerprint = file_fingerprint(file_path, full)
+        kinds.add(fingerprint.split(":")[0])
+        digest.update(os.path.basename(file_path).encode("utf-8"))
+        digest.update(fingerprint.encode("utf-8"))
+    digest.update(variant.encode("utf-8"))
+    return f"files:{'sampled' if 'sampled' in kinds else 'full'}:{digest.hexdigest()}"
+
+
+def derived_fingerprint(fingerprint, step, exact=True):
+    """Fingerprint of content derived from fingerprinted content by a deterministic step
+
+    The step is e.g. a cleaning action or the fingerprint of appended rows,
+    so the new content is identified without hashing it.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(fingerprint.encode("utf-8"))
+    digest.update(step.encode("utf-8"))
+    kind = "full" if exact and exact_fingerprint(fingerprint) else "sampled"
+    return f"derived:{kind}:{digest.hexdigest()}"
+
+
+def exact_fingerprint(fingerprint):
+    """True when the fingerprint hashed every byte of the content it stands for"""
+    kind = fingerprint.split(":")
+    return len(kind) > 2 and kind[1] == "full"
+
+
+def file_stat(file_paths):
+    """(total size, latest modification time) of the files a dataset was read from"""
+    stats = [os.stat(file_path) for file_path in file_paths]
+    return sum(stat.st_size for stat in stats), max(stat.st_mtime for stat in stats)
+
+
+def combined_stat(*stats):
+    """file_stat of the files behind several datasets, None when any of them is unknown"""
+    if any(stat is None for stat in stats):
+        return None
+    return sum(stat[0] for stat in stats), max(stat[1] for stat in stats)
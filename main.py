@@ -3,11 +3,11 @@ from PySide6.QtWidgets import (
     QMessageBox, QTableWidget, QPushButton, QTableWidgetItem,
     QTextEdit, QCheckBox, QLabel, QHBoxLayout, QGroupBox,QTabWidget,
     QRadioButton,QComboBox,QDoubleSpinBox,QInputDialog,QDialog,QListWidget,
-    QDialogButtonBox,QScrollArea
+    QDialogButtonBox,QScrollArea,QTableView,QHeaderView,QLineEdit
 
 )
-from PySide6.QtGui import QAction
-from PySide6.QtCore import Qt
+from PySide6.QtGui import QAction, QActionGroup
+from PySide6.QtCore import Qt, QTimer
 from database import DatabaseManager
 import sys
 import pandas as pd
@@ -21,6 +21,32 @@ from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
 from matplotlib.figure import Figure
 from PLOTCANVAS import PlotCanvas
 from PDFgenerator import PDFGenerator
+from data_loader import (
+    FileLoadWorker, CSV_ENGINES, list_excel_sheets, read_preview, load_provenance,
+    snapshot_variant, is_csv_path, columnar_format_of, parse_row_filter,
+    MultiFileLoadWorker, expand_sources, parse_filter_conditions
+)
+from snapshot_cache import SnapshotCache, DEFAULT_CACHE_DIR, DEFAULT_MAX_BYTES
+from out_of_core import (
+    ChunkedLoadWorker, ChunkedStatsWorker, exceeds_memory_budget, remove_orphaned_spills,
+    DEFAULT_MEMORY_BUDGET_MB, DEFAULT_SPILL_ROOT, PAGE_ROWS
+)
+from stats_engine import (
+    MOMENT_STATISTICS, COLUMN_STATISTICS, SKETCH_STATISTICS, ColumnMoments, column_moments,
+    StatisticsCache, sketch_records
+)
+from parallel_stats import ParallelStatsWorker, worth_parallel
+from process_pool import shutdown_pool
+from quantile_sketch import column_quantile_sketches, approximate_name, DEFAULT_QUANTILE_ERROR
+from mode_engine import column_mode, frame_modes, MODE_TIES
+from distinct_sketch import column_distinct_sketches, DISTINCT_SKETCH, DISTINCT_EXACT
+from column_store import ColumnStore, ColumnStoreWorker, is_storable, DEFAULT_STORE_ROOT
+from fingerprint import derived_fingerprint, exact_fingerprint, combined_stat
+from column_profile import ProfileHeaderView
+from table_model import (
+    DataFrameTableModel, ColumnWidthCache, fit_column_widths, removal_change, fill_change
+)
+from additional_features import LoadProgressDialog, LoadOptionsDialog, QuickStatsWidget
 from reportlab.lib.pagesizes import letter, A4
 from reportlab.lib import colors
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
@@ -33,6 +59,13 @@ from reportlab.lib.enums import TA_CENTER, TA_LEFT
 import json
 from app_stylesheet import MODERN_STYLESHEET
 
+DATA_FILE_FILTER = (
+    "CSV Files (*.csv);;Compressed CSV Files (*.csv.gz *.csv.bz2 *.csv.zst);;"
+    "Parquet / Feather / Arrow Files (*.parquet *.pq *.feather *.arrow *.ipc);;"
+    "Excel Files (*.xlsx *.xls);;All Files (*)"
+)
+
+
 class StatCalculator(QMainWindow):
 
     def __init__(self):
@@ -41,6 +74,7 @@ class StatCalculator(QMainWindow):
         # Initialize variables
         self.data = None
         self.current_dataset_id = None
+        self.original_dataset_id = None
         self.dataManager = DatabaseManager()
         self.fileName = None
         self.original_data = None
@@ -49,6 +83,27 @@ class StatCalculator(QMainWindow):
         self.last_test_results = None
         self.last_cleaning_summary = None
         self.generated_plots = []
+        self.load_worker = None
+        self.load_dialog = None
+        self.chunked_data = None
+        self.stats_worker = None
+        self.stats_dialog = None
+        self.page_start = 0
+        self.data_version = 0
+        self.original_data_version = 0
+        self.stats_cache = StatisticsCache()
+        self.column_store = None
+        self.column_store_key = None
+        self.column_store_worker = None
+        self.store_pending = []
+        self.store_requested = set()
+        self.original_store_key = None
+        self.snapshot_cache = SnapshotCache(
+            self.dataManager.get_preference("snapshot_cache_dir", DEFAULT_CACHE_DIR),
+            int(self.dataManager.get_preference("snapshot_cache_max_bytes", DEFAULT_MAX_BYTES))
+        )
+        # Chunks of out-of-core datasets left behind by a crash
+        remove_orphaned_spills(self.dataManager.get_preference("spill_dir", DEFAULT_SPILL_ROOT))
 
         # Setup UI
         self.setWindowTitle("Statistical Calculator")
@@ -70,19 +125,67 @@ class StatCalculator(QMainWindow):
         data_layout = QVBoxLayout()
 
         # Table
-        self.table = QTableWidget()
-        self.table.setEditTriggers(QTableWidget.NoEditTriggers)
+        # Table, a view over the DataFrame that only formats visible cells
+        self.table_model = DataFrameTableModel()
+        self.column_widths = ColumnWidthCache()
+        self.table = QTableView()
+        # Header with a histogram and missing ratio per column, profiled lazily
+        self.table.setHorizontalHeader(ProfileHeaderView(self.table))
+        self.table.setModel(self.table_model)
+        self.table.setEditTriggers(QTableView.NoEditTriggers)
         self.table.setAlternatingRowColors(True)
-        self.table.setSelectionBehavior(QTableWidget.SelectRows)
+        self.table.setSelectionBehavior(QTableView.SelectRows)
         self.table.verticalHeader().setVisible(False)
+        # Fixed row heights keep scrolling independent of the row count
+        self.table.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
         self.table.horizontalHeader().setStretchLastSection(True)
+        # Header clicks sort through cached permutations in the model
+        self.table.horizontalHeader().setSortIndicator(-1, Qt.AscendingOrder)
+        self.table.setSortingEnabled(True)
+        self.table.horizontalHeader().sectionDoubleClicked.connect(self.show_quick_stats)
+
+        # Row filter over the loaded data
+        self.filter_bar = QWidget()
+        filter_layout = QHBoxLayout()
+        filter_layout.setContentsMargins(0, 0, 0, 0)
+        self.filter_input = QLineEdit()
+        self.filter_input.setPlaceholderText("Filter rows: e.g. price > 10 and region == 'EU'")
+        self.filter_input.returnPressed.connect(self.apply_row_filter)
+        filter_btn = QPushButton("Filter")
+        filter_btn.clicked.connect(self.apply_row_filter)
+        clear_filter_btn = QPushButton("Clear")
+        clear_filter_btn.clicked.connect(self.clear_row_filter)
+        filter_layout.addWidget(self.filter_input)
+        filter_layout.addWidget(filter_btn)
+        filter_layout.addWidget(clear_filter_btn)
+        self.filter_bar.setLayout(filter_layout)
+        self.filter_bar.setEnabled(False)
 
         # Results text
         self.results_text = QTextEdit()
         self.results_text.setReadOnly(True)
         self.results_text.setPlaceholderText("Results will appear here...")
 
+        # Pager for out-of-core datasets, which are shown a page at a time
+        self.page_bar = QWidget()
+        page_layout = QHBoxLayout()
+        page_layout.setContentsMargins(0, 0, 0, 0)
+        self.prev_page_btn = QPushButton("< Previous")
+        self.prev_page_btn.clicked.connect(lambda: self.show_data_page(self.page_start - PAGE_ROWS))
+        self.page_label = QLabel()
+        self.next_page_btn = QPushButton("Next >")
+        self.next_page_btn.clicked.connect(lambda: self.show_data_page(self.page_start + PAGE_ROWS))
+        page_layout.addWidget(self.prev_page_btn)
+        page_layout.addStretch()
+        page_layout.addWidget(self.page_label)
+        page_layout.addStretch()
+        page_layout.addWidget(self.next_page_btn)
+        self.page_bar.setLayout(page_layout)
+        self.page_bar.setVisible(False)
+
+        data_layout.addWidget(self.filter_bar)
         data_layout.addWidget(self.table)
+        data_layout.addWidget(self.page_bar)
         data_layout.addWidget(self.results_text)
         data_tab.setLayout(data_layout)
 
@@ -248,9 +351,91 @@ class StatCalculator(QMainWindow):
 
         open_action = QAction("&Open", self)
         open_action.setShortcut("Ctrl+O")
-        open_action.triggered.connect(self.open_file)
+        open_action.triggered.connect(lambda: self.open_file())
         file_menu.addAction(open_action)
 
+        open_options_action = QAction("Open with &Options...", self)
+        open_options_action.setShortcut("Ctrl+Shift+O")
+        open_options_action.triggered.connect(lambda: self.open_file(choose_options=True))
+        file_menu.addAction(open_options_action)
+
+        open_folder_action = QAction("Open &Folder...", self)
+        open_folder_action.triggered.connect(self.open_folder)
+        file_menu.addAction(open_folder_action)
+
+        open_pattern_action = QAction("Open Files &Matching...", self)
+        open_pattern_action.triggered.connect(self.open_pattern)
+        file_menu.addAction(open_pattern_action)
+
+        append_action = QAction("&Append Data...", self)
+        append_action.triggered.connect(self.append_data)
+        file_menu.addAction(append_action)
+
+        # CSV parser selection, remembered between sessions
+        engine_menu = file_menu.addMenu("CSV &Engine")
+        engine_group = QActionGroup(self)
+        current_engine = self.dataManager.get_preference("csv_engine", "auto")
+        engine_labels = {
+            "auto": "Automatic (by file size)",
+            "pyarrow": "PyArrow (multithreaded)",
+            "pandas": "Pandas (single-threaded)"
+        }
+        for engine in CSV_ENGINES:
+            engine_action = QAction(engine_labels[engine], self, checkable=True)
+            engine_action.setChecked(engine == current_engine)
+            engine_action.triggered.connect(
+                lambda checked, name=engine: self.dataManager.save_preference("csv_engine", name)
+            )
+            engine_group.addAction(engine_action)
+            engine_menu.addAction(engine_action)
+
+        snapshot_action = QAction("Use &Snapshot Cache", self, checkable=True)
+        snapshot_action.setChecked(self.dataManager.get_preference("snapshot_cache_enabled", "1") == "1")
+        snapshot_action.toggled.connect(
+            lambda checked: self.dataManager.save_preference("snapshot_cache_enabled", "1" if checked else "0")
+        )
+        file_menu.addAction(snapshot_action)
+
+        optimize_action = QAction("&Optimize Memory on Load", self, checkable=True)
+        optimize_action.setChecked(self.dataManager.get_preference("optimize_dtypes", "0") == "1")
+        optimize_action.toggled.connect(
+            lambda checked: self.dataManager.save_preference("optimize_dtypes", "1" if checked else "0")
+        )
+        file_menu.addAction(optimize_action)
+
+        fingerprint_action = QAction("Full Content &Hash", self, checkable=True)
+        fingerprint_action.setChecked(self.dataManager.get_preference("full_fingerprint", "0") == "1")
+        fingerprint_action.toggled.connect(
+            lambda checked: self.dataManager.save_preference("full_fingerprint", "1" if checked else "0")
+        )
+        file_menu.addAction(fingerprint_action)
+
+        budget_action = QAction("Memory &Budget...", self)
+        budget_action.triggered.connect(self.set_memory_budget)
+        file_menu.addAction(budget_action)
+
+        workers_action = QAction("Statistics &Workers...", self)
+        workers_action.triggered.connect(self.set_stats_workers)
+        file_menu.addAction(workers_action)
+
+        approx_action = QAction("Appro&ximate Quantiles", self, checkable=True)
+        approx_action.setChecked(self.dataManager.get_preference("approx_quantiles", "0") == "1")
+        approx_action.toggled.connect(
+            lambda checked: self.dataManager.save_preference("approx_quantiles", "1" if checked else "0")
+        )
+        file_menu.addAction(approx_action)
+
+        quantile_error_action = QAction("&Quantile Error Bound...", self)
+        quantile_error_action.triggered.connect(self.set_quantile_error)
+        file_menu.addAction(quantile_error_action)
+
+        distinct_action = QAction("Exact &Distinct Counts", self, checkable=True)
+        distinct_action.setChecked(self.dataManager.get_preference("exact_distinct", "0") == "1")
+        distinct_action.toggled.connect(
+            lambda checked: self.dataManager.save_preference("exact_distinct", "1" if checked else "0")
+        )
+        file_menu.addAction(distinct_action)
+
         file_menu.addSeparator()
 
         exit_action = QAction("E&xit", self)
@@ -267,66 +452,529 @@ class StatCalculator(QMainWindow):
         about_action.triggered.connect(self.show_about)
         help_menu.addAction(about_action)
 
+    def set_memory_budget(self):
+        """Ask for the largest CSV size that is still loaded into memory"""
+        budget, ok = QInputDialog.getInt(
+            self,
+            "Memory Budget",
+            "CSV files larger than this are opened out-of-core (MB):",
+            int(self.dataManager.get_preference("memory_budget_mb", DEFAULT_MEMORY_BUDGET_MB)),
+            64,
+            1024 * 1024
+        )
+        if ok:
+            self.dataManager.save_preference("memory_budget_mb", str(budget))
+
+    def set_stats_workers(self):
+        """Ask for the number of processes used for statistics on wide datasets"""
+        workers, ok = QInputDialog.getInt(
+            self,
+            "Statistics Workers",
+            "Processes for statistics on wide datasets (0 = one per CPU core):",
+            int(self.dataManager.get_preference("stats_workers", "0")),
+            0,
+            256
+        )
+        if ok:
+            self.dataManager.save_preference("stats_workers", str(workers))
+
+    def load_options(self):
+        """Reader options from the File menu preferences"""
+        return {
+            'csv_engine': self.dataManager.get_preference("csv_engine", "auto"),
+            'optimize_dtypes': self.dataManager.get_preference("optimize_dtypes", "0") == "1",
+            'full_fingerprint': self.dataManager.get_preference("full_fingerprint", "0") == "1"
+        }
+
+    def stats_worker_count(self):
+        return int(self.dataManager.get_preference("stats_workers", "0")) or os.cpu_count() or 1
+
+    def set_quantile_error(self):
+        """Ask for the rank error allowed in approximate quantiles"""
+        error, ok = QInputDialog.getDouble(
+            self,
+            "Quantile Error Bound",
+            "Allowed rank error of approximate quantiles (%):",
+            self.quantile_error_bound() * 100,
+            0.01,
+            10.0,
+            2
+        )
+        if ok:
+            self.dataManager.save_preference("quantile_error", str(error / 100))
+
+    def quantile_error_bound(self):
+        return float(self.dataManager.get_preference("quantile_error", str(DEFAULT_QUANTILE_ERROR)))
+
+    def quantile_error(self):
+        """Error bound of approximate quantiles, None when they are computed exactly"""
+        if self.dataManager.get_preference("approx_quantiles", "0") != "1":
+            return None
+        return self.quantile_error_bound()
+
+    def statistic_key(self, calc):
+        """Cache name of a statistic, approximate medians are kept apart from exact ones"""
+        error = self.quantile_error()
+        return approximate_name(calc, error) if calc == "Median" and error is not None else calc
+
+    def approximate_statistics(self):
+        """{statistic: rank error} of the statistics sketched in memory"""
+        error = self.quantile_error()
+        return {"Median": error} if error is not None else {}
+
+    def quantile_sketches(self, columns, error):
+        """Quantile sketches of the loaded columns, built once per data version and error bound"""
+        version = self.data_version
+        name = f"quantile_sketch~{error:g}"
+        missing = self.stats_cache.missing(version, name, columns)
+        if missing:
+            self.stats_cache.store(version, name, column_quantile_sketches(
+                missing,
+                [self.column_array(col) for col in missing],
+                error
+            ))
+        return self.stats_cache.series(version, name, columns)
+
+    def distinct_counts(self, columns):
+        """Distinct values per column and whether they are exact, estimated by default"""
+        version = self.data_version
+        if self.dataManager.get_preference("exact_distinct", "0") == "1":
+            missing = self.stats_cache.missing(version, DISTINCT_EXACT, columns)
+            if missing:
+                self.stats_cache.store(version, DISTINCT_EXACT, {col: self.data[col].nunique() for col in missing})
+            return self.stats_cache.series(version, DISTINCT_EXACT, columns), True
+
+        missing = self.stats_cache.missing(version, DISTINCT_SKETCH, columns)
+        if missing:
+            self.stats_cache.store(version, DISTINCT_SKETCH, column_distinct_sketches(self.data, missing))
+        sketches = self.stats_cache.series(version, DISTINCT_SKETCH, columns)
+        return sketches.map(lambda sketch: sketch.estimate()), False
+
+    def show_quick_stats(self, index):
+        """Summary of one column from the cached distinct counts and quantile sketches"""
+        if self.data is None:
+            return
+        col = self.data.columns[index]
+        counts, exact = self.distinct_counts([col])
+        error = self.quantile_error()
+        sketch = None
+        if error is not None and pd.api.types.is_numeric_dtype(self.data[col]):
+            sketch = self.quantile_sketches([col], error)[col]
+
+        QuickStatsWidget(
+            self.data, col, self,
+            quantile_error=error,
+            distinct=(counts[col], exact),
+            quantile_sketch=sketch
+        ).exec()
+
     def create_statusbar(self):
         """Create status bar"""
         self.statusbar = self.statusBar()
         self.statusbar.showMessage("Ready")
 
-    def open_file(self):
+    def open_file(self, choose_options=False):
         """Open and load data file"""
-        file_path, _ = QFileDialog.getOpenFileName(
-            self,
-            "Open Data File",
-            "",
-            "CSV Files (*.csv);;Excel Files (*.xlsx *.xls);;All Files (*)"
+        file_path, _ = QFileDialog.getOpenFileName(self, "Open Data File", "", DATA_FILE_FILTER)
+
+        if not file_path:
+            return
+
+        if self.load_worker is not None and self.load_worker.isRunning():
+            QMessageBox.warning(self, "Busy", "Another file is still loading!")
+            return
+
+        load_options = self.load_options()
+
+        if file_path.lower().endswith((".xlsx", ".xls")):
+            try:
+                sheets = list_excel_sheets(file_path)
+            except Exception as e:
+                QMessageBox.critical(self, "Error", f"Error reading workbook: {str(e)}")
+                return
+
+            if len(sheets) > 1:
+                selected_sheets = self.select_excel_sheets(sheets)
+                if not selected_sheets:
+                    return
+                load_options['sheets'] = selected_sheets
+
+        if choose_options:
+            # Only the header and a few rows are parsed to build the dialog
+            try:
+                preview = read_preview(file_path, load_options)
+            except Exception as e:
+                QMessageBox.critical(self, "Error", f"Error reading preview: {str(e)}")
+                return
+
+            options_dialog = LoadOptionsDialog(
+                preview, self, allow_filter=columnar_format_of(file_path) is not None
+            )
+            if options_dialog.exec() != QDialog.Accepted:
+                return
+
+            selected = options_dialog.get_options()
+            if selected.get('usecols') == []:
+                QMessageBox.warning(self, "No Columns", "Please select at least one column!")
+                return
+
+            if selected.get('row_filter'):
+                try:
+                    parse_row_filter(selected['row_filter'])
+                except ValueError as e:
+                    QMessageBox.warning(self, "Invalid Filter", str(e))
+                    return
+            load_options.update(selected)
+
+        # Head and sampled reads already fit, so only full CSV reads are
+        # checked against the memory budget
+        partial = load_options.get('nrows') or load_options.get('sample_size')
+        budget_mb = int(self.dataManager.get_preference("memory_budget_mb", DEFAULT_MEMORY_BUDGET_MB))
+        out_of_core = (
+            is_csv_path(file_path)
+            and not partial
+            and exceeds_memory_budget(file_path, budget_mb)
         )
 
+        # Parse on a worker thread so the window stays responsive
+        self.load_dialog = LoadProgressDialog(os.path.basename(file_path), self)
+        if out_of_core:
+            self.statusbar.showMessage(
+                f"File is larger than the {budget_mb} MB memory budget, opening out-of-core..."
+            )
+            self.load_worker = ChunkedLoadWorker(
+                file_path,
+                load_options,
+                spill_root=self.dataManager.get_preference("spill_dir", DEFAULT_SPILL_ROOT)
+            )
+        else:
+            self.statusbar.showMessage("Loading file...")
+            self.load_worker = FileLoadWorker(
+                file_path,
+                load_options,
+                snapshot_cache=(
+                    self.snapshot_cache
+                    if self.dataManager.get_preference("snapshot_cache_enabled", "1") == "1"
+                    else None
+                )
+            )
+
+        self.load_worker.progress.connect(self.load_dialog.update_progress)
+        self.load_worker.loaded.connect(self.on_file_loaded)
+        self.load_worker.error.connect(self.on_file_load_error)
+        self.load_worker.cancelled.connect(self.on_file_load_cancelled)
+        self.load_dialog.cancel_requested.connect(self.load_worker.cancel)
+
+        self.load_worker.start()
+        self.load_dialog.show()
+
+    def append_data(self):
+        """Add the rows of another file to the loaded data"""
+        if self.out_of_core_unsupported():
+            return
+        if self.data is None:
+            QMessageBox.warning(self, "No Data", "Please load data first!")
+            return
+        if self.load_worker is not None and self.load_worker.isRunning():
+            QMessageBox.warning(self, "Busy", "Another file is still loading!")
+            return
+
+        file_path, _ = QFileDialog.getOpenFileName(self, "Append Data File", "", DATA_FILE_FILTER)
         if not file_path:
             return
 
-        self.statusbar.showMessage("Loading file...")
+        load_options = self.load_options()
+
+        self.load_dialog = LoadProgressDialog(os.path.basename(file_path), self)
+        self.statusbar.showMessage("Loading rows to append...")
+        self.load_worker = FileLoadWorker(file_path, load_options)
+
+        self.load_worker.progress.connect(self.load_dialog.update_progress)
+        self.load_worker.loaded.connect(self.on_append_loaded)
+        self.load_worker.error.connect(self.on_append_error)
+        self.load_worker.cancelled.connect(self.on_append_cancelled)
+        self.load_dialog.cancel_requested.connect(self.load_worker.cancel)
+
+        self.load_worker.start()
+        self.load_dialog.show()
+
+    def on_append_loaded(self, result):
+        """Stack the new rows under the data, merging their moments into the existing ones"""
+        self.close_load_dialog()
+        appended = result['data']
+        file_name = os.path.basename(result['file_path'])
+
+        if self.data is None:
+            return
+        if list(appended.columns) != list(self.data.columns):
+            QMessageBox.warning(
+                self,
+                "Columns Differ",
+                f"{file_name} must have the same columns as the loaded data to be appended."
+            )
+            return
+
+        numeric_cols = list(self.data.select_dtypes(include=['number']).columns)
+        not_numeric = [col for col in numeric_cols if not pd.api.types.is_numeric_dtype(appended[col])]
+        if not_numeric:
+            QMessageBox.warning(
+                self,
+                "Columns Differ",
+                f"Columns {', '.join(map(str, not_numeric))} are not numeric in {file_name}."
+            )
+            return
 
         try:
-            # Load file
-            if file_path.lower().endswith(".csv"):
-                self.data = pd.read_csv(file_path)
-            elif file_path.lower().endswith((".xlsx", ".xls")):
-                self.data = pd.read_excel(file_path)
-            else:
-                raise ValueError("Unsupported file format")
+            # Only the new rows are scanned, the existing ones contribute
+            # their cached or stored accumulators
+            appended_arrays = [appended[col].to_numpy(dtype=np.float64, na_value=np.nan) for col in numeric_cols]
+            moments = self.current_moments(numeric_cols)
+            moments.merge(column_moments(numeric_cols, appended_arrays))
+
+            # Cached quantile sketches absorb the new rows the same way
+            error = self.quantile_error()
+            sketch_name = f"quantile_sketch~{error:g}" if error is not None else None
+            sketches = None
+            if error is not None and not self.stats_cache.missing(self.data_version, sketch_name, numeric_cols):
+                sketches = column_quantile_sketches(numeric_cols, appended_arrays, error)
+                for col, sketch in self.stats_cache.series(self.data_version, sketch_name, numeric_cols).items():
+                    sketches[col].merge(sketch)
+
+            distinct_cols = [
+                col for col in appended.columns
+                if not self.stats_cache.missing(self.data_version, DISTINCT_SKETCH, [col])
+            ]
+            distinct = column_distinct_sketches(appended, distinct_cols)
+            for col, sketch in self.stats_cache.series(self.data_version, DISTINCT_SKETCH, distinct_cols).items():
+                distinct[col].merge(sketch)
+
+            self.data = pd.concat([self.data, appended], ignore_index=True)
+        except Exception as e:
+            self.on_append_error(str(e))
+            return
+
+        self.invalidate_column_store()
+        self.bump_data_version()
+        self.display_data_in_table(self.data)
+
+        for calc in MOMENT_STATISTICS:
+            self.stats_cache.store(self.data_version, calc, moments.statistic(calc))
+        for name, values in moments.sketch().items():
+            self.stats_cache.store(self.data_version, name, values)
+        if sketches is not None:
+            self.stats_cache.store(self.data_version, sketch_name, sketches)
+            self.stats_cache.store(self.data_version, self.statistic_key("Median"), {
+                col: sketch.quantile(0.5) for col, sketch in sketches.items()
+            })
+        self.stats_cache.store(self.data_version, DISTINCT_SKETCH, distinct)
+
+        # The combined content is identified by what it was built from,
+        # hashing all of it would rescan every row
+        previous, stat = self.dataManager.get_dataset_source(self.current_dataset_id)
+        appended_id = self.dataManager.register_dataset(
+            self.fileName,
+            f"Appended: {file_name}",
+            self.data,
+            fingerprint=derived_fingerprint(
+                previous, result['fingerprint'], exact_fingerprint(result['fingerprint'])
+            ) if previous else None,
+            stat=combined_stat(stat, result['stat'])
+        )
+        if appended_id:
+            self.current_dataset_id = appended_id
+            self.dataManager.save_analysis(
+                appended_id,
+                f"Append - {file_name}",
+                MOMENT_STATISTICS,
+                {
+                    col: {calc: float(moments.statistic(calc)[col]) for calc in MOMENT_STATISTICS}
+                    for col in numeric_cols
+                },
+                sketches=sketch_records(moments.sketch())
+            )
+
+        self.statusbar.showMessage(
+            f"Appended {len(appended):,} rows from {file_name} | Rows: {len(self.data):,} | "
+            "Moment statistics merged without rescanning"
+        )
+
+    def current_moments(self, columns):
+        """Moments of the loaded data from cached or stored accumulators, scanning only without them"""
+        version = self.data_version
+        if not any(self.stats_cache.missing(version, name, columns) for name in SKETCH_STATISTICS):
+            return ColumnMoments.from_sketch(columns, {
+                name: self.stats_cache.series(version, name, columns)
+                for name in SKETCH_STATISTICS
+            })
+
+        if self.current_dataset_id is not None:
+            stored = self.dataManager.get_latest_results(self.current_dataset_id, SKETCH_STATISTICS)
+            if all(
+                stored.get(str(col), {}).get(name) is not None
+                for col in columns
+                for name in SKETCH_STATISTICS
+            ):
+                return ColumnMoments.from_sketch(columns, {
+                    name: {col: stored[str(col)][name] for col in columns}
+                    for name in SKETCH_STATISTICS
+                })
+
+        return column_moments(columns, [self.column_array(col) for col in columns])
+
+    def open_folder(self):
+        """Load every supported file in a folder as one dataset"""
+        directory = QFileDialog.getExistingDirectory(self, "Open Folder of Part Files")
+        if directory:
+            self.open_sources(directory)
+
+    def open_pattern(self):
+        """Load every file matching a glob pattern as one dataset"""
+        pattern, ok = QInputDialog.getText(
+            self,
+            "Open Files Matching",
+            "Glob pattern (e.g. C:/exports/2024-*/part-*.csv.gz):"
+        )
+        if ok and pattern.strip():
+            self.open_sources(pattern.strip())
+
+    def open_sources(self, pattern):
+        """Parse the part files in parallel processes and stack them"""
+        if self.load_worker is not None and self.load_worker.isRunning():
+            QMessageBox.warning(self, "Busy", "Another file is still loading!")
+            return
+
+        file_paths = expand_sources(pattern)
+        if not file_paths:
+            QMessageBox.warning(self, "No Files", f"No supported data files found for:\n{pattern}")
+            return
+
+        load_options = self.load_options()
+
+        self.statusbar.showMessage(f"Loading {len(file_paths)} files...")
+
+        self.load_dialog = LoadProgressDialog(f"{len(file_paths)} files", self)
+        self.load_worker = MultiFileLoadWorker(pattern, file_paths, load_options, self.stats_worker_count())
+
+        self.load_worker.progress.connect(self.load_dialog.update_progress)
+        self.load_worker.loaded.connect(self.on_file_loaded)
+        self.load_worker.error.connect(self.on_file_load_error)
+        self.load_worker.cancelled.connect(self.on_file_load_cancelled)
+        self.load_dialog.cancel_requested.connect(self.load_worker.cancel)
+
+        self.load_worker.start()
+        self.load_dialog.show()
+
+    def select_excel_sheets(self, sheets):
+        """Ask which worksheets to load, returns an empty list on cancel"""
+        dialog = QDialog(self)
+        dialog.setWindowTitle("Select Sheets")
+        dialog_layout = QVBoxLayout()
+
+        dialog_layout.addWidget(QLabel("Select the sheet(s) to load:"))
+
+        list_widget = QListWidget()
+        list_widget.setSelectionMode(QListWidget.MultiSelection)
+        list_widget.addItems(sheets)
+        list_widget.item(0).setSelected(True)
+        dialog_layout.addWidget(list_widget)
+
+        buttons = QDialogButtonBox(QDialogButtonBox.Ok | QDialogButtonBox.Cancel)
+        buttons.accepted.connect(dialog.accept)
+        buttons.rejected.connect(dialog.reject)
+        dialog_layout.addWidget(buttons)
+
+        dialog.setLayout(dialog_layout)
+
+        if dialog.exec() != QDialog.Accepted:
+            return []
+
+        # Keep workbook order rather than click order
+        selected = {item.text() for item in list_widget.selectedItems()}
+        return [sheet for sheet in sheets if sheet in selected]
+
+    def close_load_dialog(self):
+        if self.load_dialog is not None:
+            self.load_dialog.accept()
+            self.load_dialog.deleteLater()
+            self.load_dialog = None
+
+    def on_file_loaded(self, result):
+        """Populate the UI once the worker hands back the parsed frame"""
+        self.close_load_dialog()
+
+        # The previous dataset is replaced either way
+        self.close_chunked_data()
+
+        # Full reads of an unchanged file share one column store across
+        # windows, anything partial gets a private one
+        partial = result['options'].get('nrows') or result['options'].get('sample_size')
+        self.original_store_key = None
+        if not partial and result['engine'] != "out-of-core" and not result.get('parts'):
+            self.original_store_key = self.snapshot_cache.cache_key(
+                result['file_path'], snapshot_variant(result['options'])
+            )
+        self.invalidate_column_store(self.original_store_key)
+
+        if result['engine'] == "out-of-core":
+            self.on_chunked_file_loaded(result)
+            return
+
+        file_path = result['file_path']
+
+        try:
+            self.data = result['data']
 
             # Get file info
             rows, cols = self.data.shape
-            self.fileName = os.path.basename(file_path)
+            self.fileName = result.get('file_name') or os.path.basename(file_path)
 
             # Display in table
+            self.bump_data_version()
+            self.reset_table_view(enabled=True)
             self.display_data_in_table(self.data)
 
+            projection, sampling = load_provenance(result['options'], result['rows_scanned'])
+
             # Update status
+            sample_note = ""
+            if sampling and sampling['method'] == 'reservoir' and result['rows_scanned']:
+                sample_note = f" (sampled from {result['rows_scanned']:,})"
+            # Throughput is measured on the file as stored, compressed or not
+            input_bytes = result.get('input_bytes') or os.path.getsize(file_path)
+            throughput = input_bytes / 1024 ** 2 / max(result['elapsed'], 1e-6)
             self.statusbar.showMessage(
-                f"Loaded: {self.fileName} | Rows: {rows}, Columns: {cols}"
+                f"Loaded: {self.fileName} | Rows: {rows}{sample_note}, Columns: {cols} | "
+                f"Engine: {result['engine']} | Parse time: {result['elapsed']:.2f}s "
+                f"({throughput:.1f} MB/s)"
             )
 
             # Save to database
             self.current_dataset_id = self.dataManager.register_dataset(
                 self.fileName,
                 file_path,
-                self.data
+                self.data,
+                snapshot_key=result['snapshot_key'],
+                projection=projection,
+                sampling=sampling,
+                fingerprint=result['fingerprint'],
+                stat=result['stat']
             )
+            self.original_dataset_id = self.current_dataset_id
 
             if self.current_dataset_id:
                 print(f"Dataset saved to database with ID: {self.current_dataset_id}")
 
+            if result['memory_report']:
+                self.results_text.setText(self.show_memory_report(result['memory_report']))
+
             # Enable calculate button
             self.calc_button.setEnabled(True)
 
         except Exception as e:
-            error_msg = f"Error loading file: {str(e)}"
-            self.statusbar.showMessage(error_msg)
-            QMessageBox.critical(self, "Error", error_msg)
-            self.data = None
+            self.on_file_load_error(str(e))
             return
         self.original_data = self.data.copy()
+        self.original_data_version = self.data_version
 
         if self.data is not None:
             columns = self.data.columns.tolist()
@@ -340,30 +988,256 @@ class StatCalculator(QMainWindow):
 
             self.populate_plot_columns()
 
-    def display_data_in_table(self, dataframe, max_rows=1000):
-        """Display DataFrame in table widget"""
-        try:
-            rows_to_show = min(len(dataframe), max_rows)
+    def on_chunked_file_loaded(self, result):
+        """Set up the paged view and streaming statistics for an out-of-core dataset"""
+        self.chunked_data = result['data']
+        self.data = None
+        self.original_data = None
+        self.bump_data_version()
+        self.fileName = os.path.basename(result['file_path'])
 
-            if len(dataframe) > max_rows:
-                QMessageBox.information(
-                    self,
-                    "Large Dataset",
-                    f"Dataset has {len(dataframe)} rows.\n"
-                    f"Displaying first {max_rows} rows only.\n\n"
-                    f"All data is loaded and will be used in calculations."
+        rows, cols = self.chunked_data.shape
+        # Pages are read from disk on demand, so there is nothing to sort
+        self.reset_table_view(enabled=False)
+        self.show_data_page(0)
+
+        self.statusbar.showMessage(
+            f"Loaded out-of-core: {self.fileName} | Rows: {rows}, Columns: {cols} | "
+            f"Chunks: {len(self.chunked_data.chunk_files)} | Spill time: {result['elapsed']:.2f}s"
+        )
+
+        projection, sampling = load_provenance(result['options'], None)
+        self.current_dataset_id = self.dataManager.register_dataset(
+            self.fileName,
+            result['file_path'],
+            self.chunked_data,
+            projection=projection,
+            sampling=sampling,
+            fingerprint=result['fingerprint'],
+            stat=result['stat']
+        )
+        self.original_dataset_id = self.current_dataset_id
+
+        self.results_text.setText(
+            "Out-of-core mode: the file is larger than the memory budget and stays on disk.\n"
+            "Browse it page by page below the table. Mean, Standard Deviation, Variance, "
+            "Min, Max and Count are computed by streaming over the chunks.\n"
+            "Cleaning, tests, plots and exports need the data in memory; use "
+            "File > Open with Options... to load a sample or a subset of columns."
+        )
+
+        # Tests and plots work on in-memory data only
+        for combo in (self.column1_combo, self.column2_combo):
+            combo.clear()
+            combo.setEnabled(False)
+
+        self.calc_button.setEnabled(True)
+
+    def show_data_page(self, start):
+        """Show one page of the out-of-core dataset in the table"""
+        if self.chunked_data is None:
+            return
+
+        total = len(self.chunked_data)
+        self.page_start = max(0, min(start, max(total - 1, 0) // PAGE_ROWS * PAGE_ROWS))
+        page = self.chunked_data.read_rows(self.page_start, PAGE_ROWS)
+        self.display_data_in_table(page, version=("page", self.data_version, self.page_start))
+
+        self.page_label.setText(
+            f"Rows {self.page_start + 1:,} - {self.page_start + len(page):,} of {total:,}"
+        )
+        self.prev_page_btn.setEnabled(self.page_start > 0)
+        self.next_page_btn.setEnabled(self.page_start + PAGE_ROWS < total)
+        self.page_bar.setVisible(True)
+
+    def close_chunked_data(self):
+        """Drop the out-of-core dataset and its spilled chunks"""
+        if self.stats_worker is not None and self.stats_worker.isRunning():
+            self.stats_worker.cancel()
+            self.stats_worker.wait()
+        if self.chunked_data is not None:
+            self.chunked_data.close()
+            self.chunked_data = None
+        self.page_bar.setVisible(False)
+
+    def invalidate_column_store(self, key=None):
+        """Forget the mapped columns once self.data no longer matches them"""
+        if self.column_store_worker is not None and self.column_store_worker.isRunning():
+            self.column_store_worker.requestInterruption()
+            self.column_store_worker.wait()
+        self.store_pending = []
+        self.store_requested.clear()
+
+        if self.column_store is not None:
+            self.column_store.release()
+            self.column_store = None
+        self.column_store_key = key
+
+    def mapped_column(self, col):
+        """Memory-mapped view of a numeric column of self.data, None until it is stored"""
+        if self.data is None or not is_storable(self.data[col]):
+            return None
+
+        try:
+            if self.column_store is None:
+                self.column_store = ColumnStore(
+                    self.column_store_key,
+                    self.dataManager.get_preference("column_store_dir", DEFAULT_STORE_ROOT)
                 )
+            mapped = self.column_store.cached(col)
+        except (OSError, ValueError) as e:
+            # A damaged or foreign file falls back to the in-memory column
+            print(f"Error mapping column {col}: {e}")
+            return None
+
+        # Columns are written by a worker thread, the in-memory data serves
+        # the callers until then
+        if mapped is None and col not in self.store_requested:
+            self.store_requested.add(col)
+            self.store_pending.append((col, self.data[col]))
+            QTimer.singleShot(0, self.start_column_store_worker)
+        return mapped
+
+    def start_column_store_worker(self):
+        if not self.store_pending or self.column_store is None:
+            return
+        if self.column_store_worker is not None and self.column_store_worker.isRunning():
+            return
+        self.column_store_worker = ColumnStoreWorker(self.column_store, self.store_pending)
+        self.store_pending = []
+        # Columns requested meanwhile are picked up next
+        self.column_store_worker.finished.connect(self.start_column_store_worker)
+        self.column_store_worker.start()
+
+    def column_values(self, col):
+        """Non-null values of a column, zero-copy from the column store when possible"""
+        mapped = self.mapped_column(col)
+        if mapped is not None:
+            return mapped.series()
+        return self.data[col].dropna()
+
+    def column_array(self, col):
+        """Float values of a numeric column with NaN for missing, mapped when possible"""
+        mapped = self.mapped_column(col)
+        if mapped is not None:
+            return mapped.values
+        return self.data[col].to_numpy(dtype=np.float64, na_value=np.nan)
+
+    def out_of_core_unsupported(self):
+        """Warn and return True when a feature needs the data in memory"""
+        if self.chunked_data is None:
+            return False
+        QMessageBox.warning(
+            self,
+            "Out-of-Core Data",
+            "This dataset is larger than the memory budget and stays on disk.\n"
+            "Only the paged view and streaming statistics are available.\n\n"
+            "Use File > Open with Options... to load a sample or fewer columns."
+        )
+        return True
+
+    def show_memory_report(self, report):
+        """Format the per-column memory savings of the load-time optimization"""
+        before_total = sum(entry['before_bytes'] for entry in report)
+        after_total = sum(entry['after_bytes'] for entry in report)
+
+        summary = []
+        summary.append("=" * 60)
+        summary.append("MEMORY OPTIMIZATION")
+        summary.append("=" * 60)
+        summary.append(f"Dataset: {self.fileName}")
+        summary.append(f"Before: {before_total / 1024 ** 2:.2f} MB")
+        summary.append(f"After: {after_total / 1024 ** 2:.2f} MB")
+        if before_total:
+            summary.append(f"Saved: {(1 - after_total / before_total) * 100:.1f}%")
+        summary.append("")
+        summary.append("--- Columns ---")
+        for entry in report:
+            summary.append(
+                f"{entry['column']} | "
+                f"{entry['before_dtype']} -> {entry['after_dtype']} | "
+                f"{entry['before_bytes'] / 1024:.1f} KB -> {entry['after_bytes'] / 1024:.1f} KB"
+            )
+        summary.append("=" * 60)
+        return "\n".join(summary)
+
+    def on_file_load_error(self, message):
+        self.close_load_dialog()
+        error_msg = f"Error loading file: {message}"
+        self.statusbar.showMessage(error_msg)
+        QMessageBox.critical(self, "Error", error_msg)
+        self.data = None
+
+    def on_file_load_cancelled(self):
+        self.close_load_dialog()
+        self.statusbar.showMessage("File loading cancelled")
+
+    def on_append_error(self, message):
+        """A failed append leaves the loaded data, moments and sketches as they were"""
+        self.close_load_dialog()
+        error_msg = f"Error appending data: {message}"
+        self.statusbar.showMessage(error_msg)
+        QMessageBox.critical(self, "Error", error_msg)
+
+    def on_append_cancelled(self):
+        self.close_load_dialog()
+        self.statusbar.showMessage("Appending data cancelled")
+
+    def reset_table_view(self, enabled):
+        """Drop any sort and filter, enabled turns sorting, filters and profiles on"""
+        self.filter_input.clear()
+        self.table.horizontalHeader().setSortIndicator(-1, Qt.AscendingOrder)
+        self.table_model.clear_view()
+        self.table.setSortingEnabled(enabled)
+        self.filter_bar.setEnabled(enabled)
+        self.table.horizontalHeader().set_profiles_enabled(enabled)
+
+    def apply_row_filter(self):
+        """Show only the rows matching the filter text"""
+        if self.data is None:
+            return
+
+        text = self.filter_input.text().strip()
+        try:
+            conditions = parse_filter_conditions(text) if text else []
+            self.table_model.set_filter(conditions)
+        except ValueError as e:
+            QMessageBox.warning(self, "Filter Error", str(e))
+            return
 
-            self.table.setRowCount(rows_to_show)
-            self.table.setColumnCount(len(dataframe.columns))
-            self.table.setHorizontalHeaderLabels(dataframe.columns.tolist())
+        self.statusbar.showMessage(
+            f"Showing {self.table_model.rowCount():,} of {self.table_model.source_row_count():,} rows"
+        )
 
-            for row_idx in range(rows_to_show):
-                for col_idx, value in enumerate(dataframe.iloc[row_idx]):
-                    item = QTableWidgetItem(str(value))
-                    self.table.setItem(row_idx, col_idx, item)
+    def clear_row_filter(self):
+        self.filter_input.clear()
+        self.apply_row_filter()
 
-            self.table.resizeColumnsToContents()
+    def bump_data_version(self):
+        """Mark self.data as changed so cached views of it are not reused"""
+        self.data_version += 1
+
+    def display_data_in_table(self, dataframe, version=None):
+        """Display DataFrame in table view"""
+        try:
+            self.table_model.set_dataframe(
+                dataframe,
+                self.data_version if version is None else version
+            )
+            self.column_widths.fit(self.table, self.table_model.column_keys())
+
+        except Exception as e:
+            QMessageBox.critical(
+                self,
+                "Display Error",
+                f"Failed to display data: {str(e)}"
+            )
+
+    def refresh_table(self, change):
+        """Update the table after cleaning, redrawing only the rows and columns it touched"""
+        try:
+            self.table_model.apply_change(self.data, change)
+            self.column_widths.fit(self.table, self.table_model.column_keys())
 
         except Exception as e:
             QMessageBox.critical(
@@ -374,7 +1248,7 @@ class StatCalculator(QMainWindow):
 
     def run_calculations(self):
         """Run selected statistical calculations"""
-        if self.data is None:
+        if self.data is None and self.chunked_data is None:
             QMessageBox.warning(self, "No Data", "Please load data first!")
             return
 
@@ -391,6 +1265,19 @@ class StatCalculator(QMainWindow):
             )
             return
 
+        if self.chunked_data is not None:
+            # Out-of-core medians are always sketched
+            approximate = {"Median": self.quantile_error_bound()}
+            stored = self.stored_results(selected_calc, self.chunked_data.numeric_columns, approximate)
+            if stored is not None:
+                self.show_calculation_results(
+                    selected_calc, stored, len(self.chunked_data),
+                    len(self.chunked_data.numeric_columns), reused=True, approximate=approximate
+                )
+                return
+            self.run_chunked_calculations(selected_calc)
+            return
+
         try:
             # Filter to numeric columns only
             numeric_data = self.data.select_dtypes(include=['number'])  # ✅ Fixed typo
@@ -403,69 +1290,319 @@ class StatCalculator(QMainWindow):
                 )
                 return
 
-            # Prepare results display
-            results = []
-            results.append("=" * 50)
-            results.append("STATISTICAL ANALYSIS RESULTS")
-            results.append("=" * 50)
-            results.append(f"Date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")  # ✅ Fixed format
-            results.append(f"Dataset: {self.fileName}")
-            results.append(f"Rows: {len(self.data)} | Columns: {len(numeric_data.columns)}")
-            results.append("")
-            results.append("-" * 50)
-            results.append("RESULTS")
-            results.append("-" * 50)
-            results.append("")
+            # Identical content was analysed before, reuse its results
+            columns = list(numeric_data.columns)
+            version = self.data_version
+
+            approximate = self.approximate_statistics()
+            stored = self.stored_results(selected_calc, columns, approximate)
+            if stored is not None:
+                for calc, res in stored.items():
+                    self.stats_cache.store(version, self.statistic_key(calc), res)
+                self.show_calculation_results(
+                    selected_calc, stored, len(self.data), len(columns), reused=True,
+                    approximate=approximate
+                )
+                return
 
-            # Store results for database
-            results_dict = {}
+            # Statistics already computed for this version of the data are
+            # reused, only the missing (column, statistic) pairs are computed
+            todo = {
+                calc: self.stats_cache.missing(version, self.statistic_key(calc), columns)
+                for calc in selected_calc
+            }
+
+            # Approximate medians come from streaming sketches, which also
+            # answer any other percentile of the column later on
+            error = self.quantile_error()
+            if error is not None and todo.get("Median"):
+                sketches = self.quantile_sketches(todo["Median"], error)
+                self.stats_cache.store(
+                    version, self.statistic_key("Median"),
+                    sketches.map(lambda sketch: sketch.quantile(0.5))
+                )
+                todo["Median"] = []
+
+            # Wide data is split into column blocks over a process pool
+            work_columns = [col for col in columns if any(col in todo[calc] for calc in selected_calc)]
+            max_workers = self.stats_worker_count()
+            if worth_parallel(len(work_columns), len(self.data), max_workers):
+                self.run_parallel_calculations(selected_calc, work_columns, todo, max_workers)
+                return
+
+            # Every moment statistic comes out of one pass over the numeric
+            # columns in row blocks, instead of one pandas reduction each
+            moment_columns = [
+                col for col in columns
+                if any(col in todo[calc] for calc in selected_calc if calc in MOMENT_STATISTICS)
+            ]
+            moments = None
+            if moment_columns:
+                moments = column_moments(
+                    moment_columns,
+                    [self.column_array(col) for col in moment_columns]
+                )
+                for name, values in moments.sketch().items():
+                    self.stats_cache.store(version, name, values)
 
             # Calculate for each selected stat
             for calc in selected_calc:
-                results.append(f"=== {calc} ===")
-
-                if calc == "Mean":
-                    res = numeric_data.mean()
+                missing = todo[calc]
+                if calc in MOMENT_STATISTICS:
+                    res = moments.statistic(calc)[missing] if missing else None
                 elif calc == "Median":
-                    res = numeric_data.median()
+                    res = numeric_data[missing].median() if missing else None
                 elif calc == "Mode":
-                    res = numeric_data.mode().iloc[0] if not numeric_data.mode().empty else None  # ✅ Fixed
-                elif calc == "Standard Deviation":
-                    res = numeric_data.std()
-                elif calc == "Variance":
-                    res = numeric_data.var()
-                elif calc == "Min":
-                    res = numeric_data.min()
-                elif calc == "Max":
-                    res = numeric_data.max()
-                elif calc == "Count":
-                    res = numeric_data.count()
+                    res = None
+                    if missing:
+                        res, ties = frame_modes(numeric_data, missing)
+                        self.stats_cache.store(version, MODE_TIES, ties)
                 else:
                     continue
 
-                for col, value in res.items():
-                    results.append(
-                        f"  {col}: {value:.4f}" if isinstance(value, float)
-                        else f"  {col}: {value}"
-                    )
+                if res is not None:
+                    self.stats_cache.store(version, self.statistic_key(calc), res)
 
-                    if col not in results_dict:
-                        results_dict[col] = {}
-                    results_dict[col][calc] = float(value) if pd.notna(value) else None
+            self.show_cached_statistics(selected_calc)
 
+        except Exception as e:
+            error_msg = f"Calculation error: {str(e)}"
+            self.statusbar.showMessage(error_msg)
+            QMessageBox.critical(self, "Calculation Error", error_msg)
+
+    def show_cached_statistics(self, selected_calc):
+        """Show the selected statistics of every numeric column from the cache"""
+        columns = list(self.data.select_dtypes(include=['number']).columns)
+        computed = {
+            calc: self.stats_cache.series(self.data_version, self.statistic_key(calc), columns)
+            for calc in selected_calc
+            if calc in COLUMN_STATISTICS
+        }
+        # Accumulators are saved along so appended rows can be merged in later
+        for name in SKETCH_STATISTICS:
+            if not self.stats_cache.missing(self.data_version, name, columns):
+                computed[name] = self.stats_cache.series(self.data_version, name, columns)
+        if "Mode" in selected_calc and not self.stats_cache.missing(self.data_version, MODE_TIES, columns):
+            computed[MODE_TIES] = self.stats_cache.series(self.data_version, MODE_TIES, columns)
+        self.show_calculation_results(
+            selected_calc, computed, len(self.data), len(columns),
+            approximate=self.approximate_statistics()
+        )
+
+    def run_parallel_calculations(self, selected_calc, columns, todo, max_workers):
+        """Compute the missing statistics of many columns in worker processes"""
+        if self.stats_worker is not None and self.stats_worker.isRunning():
+            QMessageBox.warning(self, "Busy", "Statistics are still being computed!")
+            return
+
+        self.pending_calculations = selected_calc
+        self.pending_version = self.data_version
+        self.stats_dialog = LoadProgressDialog(
+            self.fileName, self, title=f"Computing statistics for {self.fileName}"
+        )
+        # The worker converts the columns straight into shared memory
+        self.stats_worker = ParallelStatsWorker(
+            columns,
+            [self.data[col] for col in columns],
+            [calc for calc in selected_calc if calc in COLUMN_STATISTICS and todo[calc]],
+            max_workers
+        )
+
+        self.stats_worker.progress.connect(self.stats_dialog.update_progress)
+        self.stats_worker.computed.connect(self.on_parallel_stats_computed)
+        self.stats_worker.error.connect(self.on_chunked_stats_error)
+        self.stats_worker.cancelled.connect(self.on_chunked_stats_cancelled)
+        self.stats_dialog.cancel_requested.connect(self.stats_worker.cancel)
+
+        self.statusbar.showMessage(
+            f"Computing statistics of {len(columns)} columns in {max_workers} processes..."
+        )
+        self.stats_worker.start()
+        self.stats_dialog.show()
+
+    def on_parallel_stats_computed(self, computed):
+        self.close_stats_dialog()
+
+        if self.data is None or self.data_version != self.pending_version:
+            self.statusbar.showMessage("Data changed while computing, statistics discarded")
+            return
+
+        for calc, res in computed.items():
+            self.stats_cache.store(self.pending_version, self.statistic_key(calc), res)
+        try:
+            self.show_cached_statistics(self.pending_calculations)
+        except Exception as e:
+            self.on_chunked_stats_error(str(e))
+
+    def stored_results(self, selected_calc, columns, approximate=None):
+        """Stored results of the current dataset if they cover every column, else None
+
+        Statistics in approximate are only matched against results sketched
+        within the same rank error, never against exact ones.
+        """
+        if self.current_dataset_id is None:
+            return None
+
+        approximate = approximate or {}
+        names = {
+            calc: approximate_name(calc, approximate[calc]) if calc in approximate else calc
+            for calc in selected_calc
+        }
+        stored = self.dataManager.get_latest_results(self.current_dataset_id, list(names.values()))
+
+        computed = {}
+        for calc in selected_calc:
+            values = {}
+            for col in columns:
+                value = stored.get(str(col), {}).get(names[calc])
+                if value is None:
+                    return None
+                values[col] = int(value) if calc == "Count" else value
+            computed[calc] = pd.Series(values, dtype=object)
+        return computed
+
+    def run_chunked_calculations(self, selected_calc):
+        """Stream the moment statistics over the chunks of an out-of-core dataset"""
+        if self.stats_worker is not None and self.stats_worker.isRunning():
+            QMessageBox.warning(self, "Busy", "Statistics are still being computed!")
+            return
+
+        if not self.chunked_data.numeric_columns:
+            QMessageBox.critical(self, "Error", "No numeric columns found in dataset!")
+            return
+
+        self.pending_calculations = selected_calc
+        self.stats_dialog = LoadProgressDialog(
+            self.fileName, self, title=f"Computing statistics for {self.fileName}"
+        )
+        # Whole columns never fit in memory here, so quantiles are always sketched
+        self.stats_worker = ChunkedStatsWorker(
+            self.chunked_data, selected_calc, self.quantile_error_bound()
+        )
+
+        self.stats_worker.progress.connect(self.stats_dialog.update_progress)
+        self.stats_worker.computed.connect(self.on_chunked_stats_computed)
+        self.stats_worker.error.connect(self.on_chunked_stats_error)
+        self.stats_worker.cancelled.connect(self.on_chunked_stats_cancelled)
+        self.stats_dialog.cancel_requested.connect(self.stats_worker.cancel)
+
+        self.statusbar.showMessage("Computing statistics out-of-core...")
+        self.stats_worker.start()
+        self.stats_dialog.show()
+
+    def close_stats_dialog(self):
+        if self.stats_dialog is not None:
+            self.stats_dialog.accept()
+            self.stats_dialog.deleteLater()
+            self.stats_dialog = None
+
+    def on_chunked_stats_computed(self, computed):
+        self.close_stats_dialog()
+
+        # The mode needs the whole column at once
+        unavailable = {
+            calc: "Not available in out-of-core mode"
+            for calc in self.pending_calculations
+            if calc not in computed
+        }
+
+        try:
+            self.show_calculation_results(
+                self.pending_calculations,
+                computed,
+                len(self.chunked_data),
+                len(self.chunked_data.numeric_columns),
+                notes=unavailable,
+                approximate={"Median": self.quantile_error_bound()}
+            )
+        except Exception as e:
+            self.on_chunked_stats_error(str(e))
+
+    def on_chunked_stats_error(self, message):
+        self.close_stats_dialog()
+        error_msg = f"Calculation error: {message}"
+        self.statusbar.showMessage(error_msg)
+        QMessageBox.critical(self, "Calculation Error", error_msg)
+
+    def on_chunked_stats_cancelled(self):
+        self.close_stats_dialog()
+        self.statusbar.showMessage("Calculations cancelled")
+
+    def show_calculation_results(self, selected_calc, computed, row_count, column_count, notes=None,
+                                 reused=False, approximate=None):
+        """Format, display and save per-column results keyed by calculation"""
+        notes = notes or {}
+        approximate = approximate or {}
+
+        # Prepare results display
+        results = []
+        results.append("=" * 50)
+        results.append("STATISTICAL ANALYSIS RESULTS")
+        results.append("=" * 50)
+        results.append(f"Date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")  # ✅ Fixed format
+        results.append(f"Dataset: {self.fileName}")
+        results.append(f"Rows: {row_count} | Columns: {column_count}")
+        if reused:
+            results.append("Source: stored results of identical content")
+        results.append("")
+        results.append("-" * 50)
+        results.append("RESULTS")
+        results.append("-" * 50)
+        results.append("")
+
+        # Store results for database, sketched values under their own names
+        results_dict = {}
+        saved_names = {
+            calc: approximate_name(calc, approximate[calc]) if calc in approximate else calc
+            for calc in selected_calc
+        }
+
+        for calc in selected_calc:
+            if calc in notes:
+                results.append(f"=== {calc} ===")
+                results.append(f"  {notes[calc]}")
                 results.append("")
+                continue
+
+            if calc not in computed:
+                continue
+
+            if calc in approximate:
+                results.append(f"=== {calc} (approximate, rank error within {approximate[calc]:.2%}) ===")
+            else:
+                results.append(f"=== {calc} ===")
+            name = saved_names[calc]
+            res = computed[calc]
+            ties = computed.get(MODE_TIES, {}) if calc == "Mode" else {}
 
-            results.append("=" * 50)
+            for col, value in res.items():
+                tied = ties.get(col, 1)
+                results.append(
+                    (f"  {col}: {value:.4f}" if isinstance(value, float) else f"  {col}: {value}")
+                    + (f" (smallest of {tied} tied values)" if tied > 1 else "")
+                )
 
-            # Display results
-            self.results_text.setText("\n".join(results))
+                if col not in results_dict:
+                    results_dict[col] = {}
+                results_dict[col][name] = float(value) if pd.notna(value) else None
 
+            results.append("")
+
+        results.append("=" * 50)
+
+        # Display results
+        self.results_text.setText("\n".join(results))
+
+        if reused:
+            self.statusbar.showMessage("Reused stored results for identical content")
+        else:
             # Save to database
             analysis_id = self.dataManager.save_analysis(
                 self.current_dataset_id,
                 f"Analysis - {datetime.now().strftime('%Y-%m-%d %H:%M')}",
-                selected_calc,
-                results_dict
+                [saved_names[calc] for calc in selected_calc],
+                results_dict,
+                sketches=sketch_records(computed)
             )
 
             if analysis_id:
@@ -474,25 +1611,24 @@ class StatCalculator(QMainWindow):
             else:
                 self.statusbar.showMessage("Calculations completed but save failed")
 
-            self.last_statistics_results = {
-                'timestamp': datetime.now(),
-                'dataset': self.fileName,
-                'results': results_dict,
-                'calculations': selected_calc
-            }
-
-        except Exception as e:
-            error_msg = f"Calculation error: {str(e)}"
-            self.statusbar.showMessage(error_msg)
-            QMessageBox.critical(self, "Calculation Error", error_msg)
+        self.last_statistics_results = {
+            'timestamp': datetime.now(),
+            'dataset': self.fileName,
+            'results': results_dict,
+            'calculations': selected_calc
+        }
 
     def clear_data(self):
         """Clear table and reset data"""
-        self.table.clearContents()
-        self.table.setRowCount(0)
+        self.bump_data_version()
+        self.reset_table_view(enabled=False)
+        self.table_model.set_dataframe(None)
         self.results_text.clear()
+        self.close_chunked_data()
+        self.invalidate_column_store()
         self.data = None
         self.current_dataset_id = None
+        self.original_dataset_id = None
         self.fileName = None
         self.calc_button.setEnabled(False)
         self.statusbar.showMessage("Data cleared. Ready to load new file.")
@@ -509,6 +1645,13 @@ class StatCalculator(QMainWindow):
 
     def closeEvent(self, event):
         """Handle window close event"""
+        if self.load_worker is not None and self.load_worker.isRunning():
+            self.load_worker.cancel()
+            self.load_worker.wait()
+        self.table.horizontalHeader().stop()
+        self.close_chunked_data()
+        self.invalidate_column_store()
+        shutdown_pool()
         self.dataManager.close()
         event.accept()
 
@@ -530,6 +1673,8 @@ class StatCalculator(QMainWindow):
         self.data_cleaning.setLayout(cleaning_layout)
 
     def showData(self):
+        if self.out_of_core_unsupported():
+            return
         if self.data is None:
             QMessageBox.warning(self, "No Data", "Please load data first!")
             return
@@ -556,6 +1701,8 @@ class StatCalculator(QMainWindow):
         self.results_text.setText("\n".join(infos))
 
     def missingValues(self):
+        if self.out_of_core_unsupported():
+            return
         if self.data is None:
             QMessageBox.warning(self, "No Data", "Please load data first!")
             return
@@ -583,26 +1730,33 @@ class StatCalculator(QMainWindow):
 
         action_taken = None
 
+        missing = self.data.isnull()
+
         if clicked == btn_remove:
-            self.data.dropna(inplace=True)
+            removed = missing.any(axis=1).to_numpy()
+            self.data = self.data[~removed]
+            change = removal_change(removed)
             action_taken = "Removed rows with missing values"
 
         elif clicked == btn_mean:
             numeric_cols = self.data.select_dtypes(include=['number']).columns
             self.data[numeric_cols] = self.data[numeric_cols].fillna(self.data[numeric_cols].mean())
+            change = fill_change(missing, self.data)
             action_taken = "Filled missing values with mean"
 
         elif clicked == btn_median:
             numeric_cols = self.data.select_dtypes(include=['number']).columns
             self.data[numeric_cols] = self.data[numeric_cols].fillna(self.data[numeric_cols].median())
+            change = fill_change(missing, self.data)
             action_taken = "Filled missing values with median"
 
         elif clicked == btn_mode:
             for col in self.data.columns:
-                if self.data[col].isnull().any():
-                    mode_value = self.data[col].mode()
-                    if not mode_value.empty:
-                        self.data[col].fillna(mode_value.iloc[0], inplace=True)
+                if missing[col].any():
+                    mode_value = column_mode(self.data[col])['mode']
+                    if pd.notna(mode_value):
+                        self.data[col] = self.data[col].fillna(mode_value)
+            change = fill_change(missing, self.data)
             action_taken = "Filled missing values with mode"
 
         else:
@@ -612,7 +1766,9 @@ class StatCalculator(QMainWindow):
         after_rows = len(self.data)
         after_missing = self.data.isnull().sum().sum()
 
-        self.display_data_in_table(self.data)
+        self.invalidate_column_store()
+        self.bump_data_version()
+        self.refresh_table(change)
 
         summary = self.show_cleaning_summary(
             action_taken,
@@ -630,12 +1786,15 @@ class StatCalculator(QMainWindow):
             self.statusbar.showMessage(f"{action_taken} (database save failed)")
 
     def removeDups(self):
+        if self.out_of_core_unsupported():
+            return
         if self.data is None:
             QMessageBox.warning(self, "No Data", "Please load data first!")
             return
 
         before_rows = len(self.data)
-        dups = self.data.duplicated().sum()
+        duplicated = self.data.duplicated().to_numpy()
+        dups = int(duplicated.sum())
 
         if dups == 0:
             self.results_text.setText("No duplicate rows found in dataset")
@@ -649,10 +1808,12 @@ class StatCalculator(QMainWindow):
         )
 
         if reply == QMessageBox.Yes:
-            self.data.drop_duplicates(inplace=True)
+            self.data = self.data[~duplicated]
             after_rows = len(self.data)
+            self.invalidate_column_store()
+            self.bump_data_version()
 
-            self.display_data_in_table(self.data)
+            self.refresh_table(removal_change(duplicated))
 
             summary = self.show_cleaning_summary(
                 "Removed duplicate rows",
@@ -723,7 +1884,11 @@ class StatCalculator(QMainWindow):
 
         if reply == QMessageBox.Yes:
             self.data = self.original_data.copy()
-            self.display_data_in_table(self.data)
+            self.current_dataset_id = self.original_dataset_id
+            self.invalidate_column_store(self.original_store_key)
+            self.bump_data_version()
+            # Shown as the loaded version, whatever the table still has cached for it is reused
+            self.display_data_in_table(self.data, version=self.original_data_version)
             self.results_text.setText(
                 "=" * 60 + "\n" +
                 "DATA RESET TO ORIGINAL\n" +
@@ -745,16 +1910,23 @@ class StatCalculator(QMainWindow):
             extension = os.path.splitext(self.fileName)[1]
             cleaned_filename = f"{base_name}_cleaned{extension}"
 
+            # Cleaning is deterministic, so the action identifies the result
+            previous, stat = self.dataManager.get_dataset_source(self.current_dataset_id)
             cleaned_dataset_id = self.dataManager.register_dataset(
                 cleaned_filename,
                 f"Cleaned: {cleaning_action}",
-                self.data
+                self.data,
+                fingerprint=derived_fingerprint(previous, cleaning_action) if previous else None,
+                stat=stat
             )
 
             if cleaned_dataset_id:
+                # Further analyses belong to the cleaned content
+                self.current_dataset_id = cleaned_dataset_id
+
                 cleaning_details = {
                     'action': cleaning_action,
-                    'original_dataset_id': str(self.current_dataset_id),
+                    'original_dataset_id': str(self.original_dataset_id),
                     'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
                     'rows_before': len(self.original_data) if self.original_data is not None else 0,
                     'rows_after': len(self.data),
@@ -771,10 +1943,13 @@ class StatCalculator(QMainWindow):
                 print(f"Cleaned data saved to database with ID: {cleaned_dataset_id}")
                 return cleaned_dataset_id
 
+            # Results of the data before cleaning must not be reused for it
+            self.current_dataset_id = None
             return None
 
         except Exception as e:
             print(f"Error saving cleaned data: {str(e)}")
+            self.current_dataset_id = None
             return None
 
     def create_tests_panel(self):
@@ -900,6 +2075,8 @@ class StatCalculator(QMainWindow):
             self.column2_combo.setEnabled(False)
 
     def run_test(self):
+        if self.out_of_core_unsupported():
+            return
         if self.data is None :
             QMessageBox.warning(self,"No data","Please load data first")
             return
@@ -922,7 +2099,7 @@ class StatCalculator(QMainWindow):
             QMessageBox().warning(self,"No column","Please select a column")
             return
 
-        data = self.data[column_name].dropna()
+        data = self.column_values(column_name)
 
         if len(data) == 0:
             QMessageBox.warning(self,"Error","Selected an empty column")
@@ -1028,8 +2205,8 @@ class StatCalculator(QMainWindow):
             QMessageBox.warning(self,"Same column","please choose two different columns")
             return
 
-        data1 = self.data[col1_name].dropna()
-        data2 = self.data[col2_name].dropna()
+        data1 = self.column_values(col1_name)
+        data2 = self.column_values(col2_name)
 
         if len(data1) == 0 or len(data2) == 0:
             QMessageBox.warning(self,"Error","one or both columns are empty")
@@ -1250,14 +2427,17 @@ class StatCalculator(QMainWindow):
             QMessageBox.warning(self, "Error", "One or both columns are empty!")
             return
 
-        unique1 = data1.nunique()
-        unique2 = data2.nunique()
+        # The warning only needs a rough count, cached sketches give one
+        # without hashing both columns again
+        counts, exact = self.distinct_counts([col1_name, col2_name])
+        unique1, unique2 = counts[col1_name], counts[col2_name]
+        about = "" if exact else "about "
 
         if unique1 > 20 or unique2 > 20:
             reply = QMessageBox.question(
                 self,
                 "Many Categories",
-                f"Column 1 has {unique1} unique values and Column 2 has {unique2}.\n"
+                f"Column 1 has {about}{unique1} unique values and Column 2 has {about}{unique2}.\n"
                 "Chi-square works best with categorical data (few categories).\n\n"
                 "Continue anyway?",
                 QMessageBox.Yes | QMessageBox.No
@@ -1285,8 +2465,8 @@ class StatCalculator(QMainWindow):
             results.append("Tests whether two categorical variables are independent")
             results.append("")
             results.append("--- Variables Tested ---")
-            results.append(f"Variable 1: {col1_name} ({unique1} categories)")
-            results.append(f"Variable 2: {col2_name} ({unique2} categories)")
+            results.append(f"Variable 1: {col1_name} ({contingency_table.shape[0]} categories)")
+            results.append(f"Variable 2: {col2_name} ({contingency_table.shape[1]} categories)")
             results.append("")
             results.append("--- Contingency Table ---")
             results.append(str(contingency_table))
@@ -1782,6 +2962,8 @@ class StatCalculator(QMainWindow):
 
     def generate_plot(self):
         """Generate the selected plot with appropriate columns"""
+        if self.out_of_core_unsupported():
+            return
         if self.data is None:
             QMessageBox.warning(self, "No Data", "Please load data first!")
             return
@@ -1793,7 +2975,7 @@ class StatCalculator(QMainWindow):
                 if not col:
                     QMessageBox.warning(self, "No Column", "Select a column!")
                     return
-                data = self.data[col].dropna()
+                data = self.column_values(col)
                 if len(data) == 0:
                     QMessageBox.warning(self, "Empty Data", f"{col} has no data!")
                     return
@@ -1810,7 +2992,7 @@ class StatCalculator(QMainWindow):
                 plot_data = []
                 labels = []
                 for col in selected_cols:
-                    data = self.data[col].dropna()
+                    data = self.column_values(col)
                     if len(data) > 0:
                         plot_data.append(data)
                         labels.append(col)
@@ -1933,7 +3115,7 @@ class StatCalculator(QMainWindow):
                     plot_data = []
                     labels = []
                     for col in selected_cols:
-                        data = self.data[col].dropna()
+                        data = self.column_values(col)
                         if len(data) > 0:
                             plot_data.append(data)
                             labels.append(col)
@@ -2118,6 +3300,8 @@ class StatCalculator(QMainWindow):
 
     def generate_pdf_report(self):
         """Generate comprehensive PDF report"""
+        if self.out_of_core_unsupported():
+            return
         if self.data is None:
             QMessageBox.warning(self, "No Data", "Please load data first!")
             return
@@ -2319,6 +3503,8 @@ class StatCalculator(QMainWindow):
 
     def export_data_csv(self):
         """Export current dataset to CSV"""
+        if self.out_of_core_unsupported():
+            return
         if self.data is None:
             QMessageBox.warning(self, "No Data", "No data to export!")
             return
@@ -2459,7 +3645,7 @@ class StatCalculator(QMainWindow):
                 self.history_table.setItem(row_idx, 4, QTableWidgetItem(
                     calc_display[:50] + "..." if len(calc_display) > 50 else calc_display))
 
-            self.history_table.resizeColumnsToContents()
+            fit_column_widths(self.history_table)
             self.history_status.setText(f"✅ Loaded {len(history)} analysis records")
             self.history_status.setStyleSheet("color: green;")
 
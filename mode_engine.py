@@ -0,0 +1,118 @@
+import numpy as np
+import pandas as pd
+
+
+# Integer ranges up to this wide are counted in a dense array
+BINCOUNT_MAX_RANGE = 1 << 20
+
+# Number of values sharing the top count, kept next to the Mode results
+MODE_TIES = "mode:ties"
+
+
+def _result(mode, count, ties):
+    return {'mode': mode, 'count': int(count), 'ties': int(ties)}
+
+
+def _empty_result():
+    return _result(np.nan, 0, 0)
+
+
+def _dense_integer_mode(values, low, span):
+    """Mode of integers within low..low+span via bincount"""
+    counts = np.bincount((values - low).astype(np.intp, copy=False), minlength=span + 1)
+    top = counts.max()
+    tied = np.flatnonzero(counts == top)
+    return low + tied[0], top, len(tied)
+
+
+def _counted_range(values):
+    """(low, span) when the integer values are narrow enough for bincount, else None"""
+    low, high = values.min(), values.max()
+    span = float(high) - float(low)
+    if span <= BINCOUNT_MAX_RANGE and span <= 2 * len(values) + 256:
+        return low, int(span)
+    return None
+
+
+def _run_length_mode(values):
+    """Mode of any sortable values from the run lengths of the sorted array"""
+    ordered = np.sort(values)
+    starts = np.flatnonzero(np.concatenate(([True], ordered[1:] != ordered[:-1])))
+    lengths = np.diff(np.append(starts, len(ordered)))
+    top = lengths.max()
+    tied = starts[lengths == top]
+    return ordered[tied[0]], top, len(tied)
+
+
+def array_mode(values):
+    """Mode of a float array where NaN marks missing, the smallest value wins ties"""
+    values = np.asarray(values, dtype=np.float64)
+    values = values[~np.isnan(values)]
+    if not len(values):
+        return _empty_result()
+
+    # Numeric columns read with missing values are floats holding integers
+    with np.errstate(invalid="ignore"):
+        integers = values.astype(np.int64)
+    if np.array_equal(integers, values):
+        counted = _counted_range(integers)
+        if counted is not None:
+            mode, count, ties = _dense_integer_mode(integers, *counted)
+            return _result(float(mode), count, ties)
+
+    mode, count, ties = _run_length_mode(values)
+    return _result(float(mode), count, ties)
+
+
+def column_mode(series):
+    """Mode of a column with its count and the number of values tied at that count"""
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        codes = series.cat.codes.to_numpy()
+        codes = codes[codes >= 0]
+        if not len(codes):
+            return _empty_result()
+        counts = np.bincount(codes, minlength=len(series.cat.categories))
+        top = counts.max()
+        tied = np.flatnonzero(counts == top)
+        return _result(series.cat.categories[tied[0]], top, len(tied))
+
+    if pd.api.types.is_integer_dtype(series):
+        values = series.dropna().to_numpy(dtype=np.int64)
+        if not len(values):
+            return _empty_result()
+        counted = _counted_range(values)
+        if counted is not None:
+            mode, count, ties = _dense_integer_mode(values, *counted)
+        else:
+            mode, count, ties = _run_length_mode(values)
+        return _result(int(mode), count, ties)
+
+    if pd.api.types.is_float_dtype(series):
+        return array_mode(series.to_numpy(dtype=np.float64, na_value=np.nan))
+
+    if series.dtype == np.bool_ and len(series):
+        counts = np.bincount(series.to_numpy().view(np.uint8), minlength=2)
+        top = counts.max()
+        return _result(bool(counts[1] > counts[0]), top, 1 + (counts[0] == counts[1]))
+
+    # Text, dates and the rest: one hash pass counts every distinct value
+    counts = series.value_counts(sort=False, dropna=True)
+    if counts.empty:
+        return _empty_result()
+    top = counts.max()
+    tied = counts.index[counts.to_numpy() == top]
+    try:
+        mode = min(tied)
+    except TypeError:
+        mode = tied[0]
+    return _result(mode, top, len(tied))
+
+
+def frame_modes(dataframe, columns=None):
+    """Mode Series and tie count Series over the columns of a frame"""
+    columns = list(dataframe.columns if columns is None else columns)
+    results = [column_mode(dataframe[col]) for col in columns]
+    return (
+        pd.Series([result['mode'] for result in results], index=columns, dtype=object),
+        pd.Series([result['ties'] for result in results], index=columns, dtype=np.int64)
+    )
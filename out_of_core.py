@@ -0,0 +1,332 @@
+from PySide6.QtCore import QThread, Signal
+import numpy as np
+import pandas as pd
+import json
+import os
+import shutil
+import tempfile
+import time
+
+try:
+    import pyarrow.feather as feather
+except ImportError:
+    feather = None
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+    import msvcrt
+
+from data_loader import LoadCancelled, read_csv_file, estimated_csv_bytes, snapshot_variant
+from fingerprint import dataset_fingerprint, file_stat
+from stats_engine import ColumnMoments, MOMENT_STATISTICS
+from quantile_sketch import KLLSketch, DEFAULT_QUANTILE_ERROR
+
+
+DEFAULT_SPILL_ROOT = os.path.join(os.path.expanduser("~"), ".stats_calc", "chunks")
+DEFAULT_MEMORY_BUDGET_MB = 4096
+PAGE_ROWS = 1000
+
+# Chunks are spilled as compressed Feather so a pass reads only the columns
+# it needs, pickles are the fallback without pyarrow
+SPILL_EXTENSION = ".feather" if feather is not None else ".pkl"
+
+# Each spill directory holds this file locked while its dataset is open,
+# unlocked directories older than the grace period are left from a crash
+OWNER_LOCK = "owner.lock"
+ORPHAN_GRACE_SECONDS = 60
+
+
+def write_chunk(chunk, chunk_path):
+    if feather is not None:
+        feather.write_feather(chunk.reset_index(drop=True), chunk_path, compression="lz4")
+    else:
+        chunk.to_pickle(chunk_path)
+
+
+def read_chunk(chunk_path, columns=None):
+    """One spilled chunk, only the given columns when set"""
+    if chunk_path.endswith(".feather"):
+        return feather.read_table(chunk_path, columns=columns).to_pandas()
+    chunk = pd.read_pickle(chunk_path)
+    return chunk[columns] if columns is not None else chunk
+
+
+def lock_owner(handle):
+    """Lock a spill directory's owner file without waiting, False when another process holds it"""
+    try:
+        if fcntl is not None:
+            fcntl.flock(handle, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        else:
+            msvcrt.locking(handle.fileno(), msvcrt.LK_NBLCK, 1)
+        return True
+    except OSError:
+        return False
+
+
+def remove_orphaned_spills(spill_root=DEFAULT_SPILL_ROOT):
+    """Delete spill directories whose owning process exited without closing them"""
+    if not os.path.isdir(spill_root):
+        return
+
+    for name in os.listdir(spill_root):
+        path = os.path.join(spill_root, name)
+        if not name.startswith("dataset_") or not os.path.isdir(path):
+            continue
+        try:
+            if time.time() - os.path.getmtime(path) < ORPHAN_GRACE_SECONDS:
+                continue
+            with open(os.path.join(path, OWNER_LOCK), "a+") as handle:
+                if not lock_owner(handle):
+                    continue
+        except OSError:
+            continue
+        shutil.rmtree(path, ignore_errors=True)
+
+
+def exceeds_memory_budget(file_path, budget_mb):
+    """True when a CSV is too large to parse into memory under the budget"""
+    # Parsed frames are rarely smaller than the text they came from, so the
+    # size of the text is a conservative lower bound on the in-memory size
+    return estimated_csv_bytes(file_path) > budget_mb * 1024 ** 2
+
+
+class ChunkedDataset:
+    """A CSV kept on disk as row chunks, read back one chunk at a time"""
+
+    def __init__(self, source_path, spill_dir, chunk_files, row_counts, columns, numeric_columns,
+                 owner_lock=None):
+        self.source_path = source_path
+        self.spill_dir = spill_dir
+        self.owner_lock = owner_lock
+        self.chunk_files = chunk_files
+        self.row_counts = np.asarray(row_counts, dtype=np.int64)
+        self.row_offsets = np.concatenate([[0], np.cumsum(self.row_counts)])
+        self.columns = pd.Index(columns)
+        self.numeric_columns = numeric_columns
+
+    @property
+    def shape(self):
+        return int(self.row_offsets[-1]), len(self.columns)
+
+    def __len__(self):
+        return int(self.row_offsets[-1])
+
+    def iter_chunks(self, columns=None):
+        for chunk_path in self.chunk_files:
+            yield read_chunk(chunk_path, columns)
+
+    def read_rows(self, start, count):
+        """Rows [start, start + count) as one DataFrame, for paged display"""
+        stop = min(start + count, len(self))
+        if start >= stop:
+            return pd.DataFrame(columns=self.columns)
+
+        first = int(np.searchsorted(self.row_offsets, start, side="right") - 1)
+        last = int(np.searchsorted(self.row_offsets, stop - 1, side="right") - 1)
+
+        pieces = []
+        for idx in range(first, last + 1):
+            chunk = read_chunk(self.chunk_files[idx])
+            offset = self.row_offsets[idx]
+            pieces.append(chunk.iloc[max(start - offset, 0):stop - offset])
+
+        page = pd.concat(pieces) if len(pieces) > 1 else pieces[0]
+        page.index = pd.RangeIndex(start, stop)
+        return page
+
+    def close(self):
+        """Remove the spilled chunks from disk"""
+        if self.owner_lock is not None:
+            self.owner_lock.close()
+            self.owner_lock = None
+        shutil.rmtree(self.spill_dir, ignore_errors=True)
+
+
+class ChunkSpiller:
+    """Collector that writes each parsed chunk to disk instead of keeping it"""
+
+    def __init__(self, source_path, spill_root=DEFAULT_SPILL_ROOT):
+        os.makedirs(spill_root, exist_ok=True)
+        self.source_path = source_path
+        self.spill_dir = tempfile.mkdtemp(prefix="dataset_", dir=spill_root)
+        # Held until the dataset is closed, see remove_orphaned_spills
+        self.owner_lock = open(os.path.join(self.spill_dir, OWNER_LOCK), "a+")
+        lock_owner(self.owner_lock)
+        self.chunk_files = []
+        self.row_counts = []
+        self.columns = None
+        self.numeric_columns = None
+        self.rows_seen = 0
+
+    def add(self, chunk):
+        chunk_path = os.path.join(self.spill_dir, f"chunk_{len(self.chunk_files):06d}{SPILL_EXTENSION}")
+        write_chunk(chunk, chunk_path)
+        self.chunk_files.append(chunk_path)
+        self.row_counts.append(len(chunk))
+        self.rows_seen += len(chunk)
+
+        # A column only counts as numeric if every chunk parsed it as numeric
+        chunk_numeric = set(chunk.select_dtypes(include=['number']).columns)
+        if self.columns is None:
+            self.columns = chunk.columns.tolist()
+            self.numeric_columns = chunk_numeric
+        else:
+            self.numeric_columns &= chunk_numeric
+
+    def result(self):
+        columns = self.columns or []
+        numeric_columns = [col for col in columns if col in (self.numeric_columns or set())]
+
+        with open(os.path.join(self.spill_dir, "manifest.json"), "w") as manifest:
+            json.dump({
+                'source_path': self.source_path,
+                'row_counts': self.row_counts,
+                'columns': columns,
+                'numeric_columns': numeric_columns
+            }, manifest)
+
+        return ChunkedDataset(
+            self.source_path,
+            self.spill_dir,
+            self.chunk_files,
+            self.row_counts,
+            columns,
+            numeric_columns,
+            self.owner_lock
+        )
+
+    def discard(self):
+        self.owner_lock.close()
+        shutil.rmtree(self.spill_dir, ignore_errors=True)
+
+
+def chunked_statistics(dataset, calculations, progress_callback=None, is_cancelled=None,
+                       quantile_error=DEFAULT_QUANTILE_ERROR):
+    """Streaming chunk-wise aggregation of the moment statistics and approximate medians"""
+    columns = dataset.numeric_columns
+    moments = ColumnMoments(columns)
+    sketches = (
+        {col: KLLSketch.for_error(quantile_error) for col in columns}
+        if "Median" in calculations else None
+    )
+    total_chunks = max(len(dataset.chunk_files), 1)
+
+    for idx, chunk in enumerate(dataset.iter_chunks(columns)):
+        if is_cancelled and is_cancelled():
+            raise LoadCancelled()
+
+        block = chunk.to_numpy(dtype=np.float64, na_value=np.nan)
+        moments.update(block)
+        if sketches is not None:
+            for position, col in enumerate(columns):
+                sketches[col].update(block[:, position])
+
+        if progress_callback:
+            progress_callback(
+                int((idx + 1) / total_chunks * 100),
+                f"Aggregated chunk {idx + 1} of {total_chunks}"
+            )
+
+    results = {
+        calc: moments.statistic(calc)
+        for calc in calculations
+        if calc in MOMENT_STATISTICS
+    }
+    if sketches is not None:
+        results["Median"] = pd.Series({col: sketch.quantile(0.5) for col, sketch in sketches.items()})
+    results.update(moments.sketch())
+    return results
+
+
+class ChunkedLoadWorker(QThread):
+
+    progress = Signal(int, str)
+    loaded = Signal(dict)
+    error = Signal(str)
+    cancelled = Signal()
+
+    def __init__(self, file_path, options=None, spill_root=DEFAULT_SPILL_ROOT):
+        super().__init__()
+        self.file_path = file_path
+        self.options = options or {}
+        self.spill_root = spill_root
+
+    def cancel(self):
+        self.requestInterruption()
+
+    def run(self):
+        spiller = None
+        try:
+            start = time.perf_counter()
+
+            spiller = ChunkSpiller(self.file_path, self.spill_root)
+            read_csv_file(
+                self.file_path,
+                progress_callback=self.progress.emit,
+                is_cancelled=self.isInterruptionRequested,
+                usecols=self.options.get("usecols"),
+                collector=spiller
+            )
+
+            data = spiller.result()
+            fingerprint = dataset_fingerprint(
+                self.file_path,
+                snapshot_variant(self.options),
+                full=self.options.get("full_fingerprint", False)
+            )
+
+            self.loaded.emit({
+                'data': data,
+                'file_path': self.file_path,
+                'engine': "out-of-core",
+                'snapshot_key': None,
+                'fingerprint': fingerprint,
+                'stat': file_stat([self.file_path]),
+                'memory_report': None,
+                'rows_scanned': None,
+                'options': self.options,
+                'elapsed': time.perf_counter() - start
+            })
+
+        except LoadCancelled:
+            spiller.discard()
+            self.cancelled.emit()
+        except Exception as e:
+            if spiller is not None:
+                spiller.discard()
+            self.error.emit(str(e))
+
+
+class ChunkedStatsWorker(QThread):
+
+    progress = Signal(int, str)
+    computed = Signal(dict)
+    error = Signal(str)
+    cancelled = Signal()
+
+    def __init__(self, dataset, calculations, quantile_error=DEFAULT_QUANTILE_ERROR):
+        super().__init__()
+        self.dataset = dataset
+        self.calculations = calculations
+        self.quantile_error = quantile_error
+
+    def cancel(self):
+        self.requestInterruption()
+
+    def run(self):
+        try:
+            results = chunked_statistics(
+                self.dataset,
+                self.calculations,
+                progress_callback=self.progress.emit,
+                is_cancelled=self.isInterruptionRequested,
+                quantile_error=self.quantile_error
+            )
+            self.computed.emit(results)
+
+        except LoadCancelled:
+            self.cancelled.emit()
+        except Exception as e:
+            self.error.emit(str(e))
@@ -0,0 +1,45 @@
+from multiprocessing import shared_memory
+import numpy as np
+
+from stats_engine import ColumnMoments, MOMENT_STATISTICS, block_rows_for
+from mode_engine import array_mode, MODE_TIES
+
+
+# Runs inside the pool processes, so it only imports numpy and the
+# statistics kernels, never Qt or the GUI script
+
+
+def block_statistics(shm_name, shape, start, stop, statistics):
+    """Statistics of columns start:stop of a shared (columns x rows) block"""
+    # Spawned workers share the parent's resource tracker, which unlinks
+    # the segment once the parent is done with it
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        block = np.ndarray(shape, dtype=np.float64, buffer=shm.buf)[start:stop]
+        results = {}
+
+        if any(stat in MOMENT_STATISTICS for stat in statistics):
+            moments = ColumnMoments(range(stop - start))
+            block_rows = block_rows_for(stop - start)
+            for row in range(0, shape[1], block_rows):
+                moments.update(block[:, row:row + block_rows].T)
+            results['moments'] = moments
+
+        if "Median" in statistics:
+            with np.errstate(all="ignore"):
+                results['Median'] = np.nanmedian(block, axis=1) if shape[1] else np.full(stop - start, np.nan)
+
+        if "Mode" in statistics:
+            modes = [array_mode(values) for values in block]
+            results['Mode'] = np.array([mode['mode'] for mode in modes], dtype=np.float64)
+            results[MODE_TIES] = np.array([mode['ties'] for mode in modes], dtype=np.float64)
+
+        del block
+        return results
+    finally:
+        shm.close()
+
+
+def ready():
+    """No-op task that makes the pool start its processes"""
+    return True
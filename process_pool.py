@@ -0,0 +1,57 @@
+from concurrent.futures import ProcessPoolExecutor
+import multiprocessing
+import sys
+import threading
+import types
+
+from parallel_worker import ready
+
+
+# One pool serves every statistics run and multi-file load, its processes
+# start once per session
+_pool = None
+_pool_workers = 0
+_pool_lock = threading.Lock()
+
+
+def worker_pool(max_workers):
+    """The shared process pool, restarted only when the worker count changes
+
+    Starting processes swaps the process-wide __main__ module, so the GUI
+    calls this from its own thread before handing the pool to a worker.
+    """
+    global _pool, _pool_workers
+    with _pool_lock:
+        if _pool is not None and _pool_workers == max_workers:
+            return _pool
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+
+        # Spawned processes import the parent's main script to resolve
+        # pickled functions; the tasks live in modules without the GUI, so
+        # the script is hidden while the processes start
+        pool = ProcessPoolExecutor(
+            max_workers=max_workers,
+            mp_context=multiprocessing.get_context("spawn")
+        )
+        # Each submit starts a process right away; they import in the
+        # background, so nothing here waits for them
+        main_module = sys.modules["__main__"]
+        sys.modules["__main__"] = types.ModuleType("__main__")
+        try:
+            for _ in range(max_workers):
+                pool.submit(ready)
+        finally:
+            sys.modules["__main__"] = main_module
+
+        _pool, _pool_workers = pool, max_workers
+        return pool
+
+
+def shutdown_pool():
+    """Stop the shared pool, e.g. when the application closes"""
+    global _pool, _pool_workers
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+        _pool, _pool_workers = None, 0
@@ -0,0 +1,126 @@
+import math
+import numpy as np
+
+from stats_engine import BLOCK_ROWS
+
+
+DEFAULT_QUANTILE_ERROR = 0.01
+MIN_K = 8
+
+# Each level may hold this fraction of the items of the level above it
+CAPACITY_DECAY = 2 / 3
+
+
+def approximate_name(statistic, epsilon):
+    """Name of a statistic computed within a rank error, kept apart from its exact value"""
+    return f"{statistic}~{epsilon:g}"
+
+
+def k_for_error(epsilon):
+    """Smallest sketch size k whose normalized rank error stays within epsilon"""
+    # Empirical fit of the KLL rank error published with Apache DataSketches
+    return max(MIN_K, math.ceil((2.296 / epsilon) ** (1 / 0.9723)))
+
+
+class KLLSketch:
+    """Mergeable approximate quantiles of a stream of numbers (Karnin, Lang & Liberty)"""
+
+    def __init__(self, k=200, seed=None):
+        self.k = k
+        self.levels = [np.empty(0)]
+        self.count = 0
+        self.min = np.inf
+        self.max = -np.inf
+        self.rng = np.random.default_rng(seed)
+        self._sorted = None
+
+    @classmethod
+    def for_error(cls, epsilon, seed=None):
+        return cls(k_for_error(epsilon), seed)
+
+    def capacity(self, level):
+        depth = len(self.levels) - level - 1
+        return max(math.ceil(self.k * CAPACITY_DECAY ** depth), 2)
+
+    def update(self, values):
+        """Fold in an array of values, NaN is skipped"""
+        values = np.asarray(values, dtype=np.float64).ravel()
+        values = values[~np.isnan(values)]
+        if not len(values):
+            return
+
+        self.count += len(values)
+        self.min = min(self.min, float(values.min()))
+        self.max = max(self.max, float(values.max()))
+        self.levels[0] = np.concatenate([self.levels[0], values])
+        self._compress()
+
+    def merge(self, other):
+        """Fold in a sketch built over other values, e.g. another chunk"""
+        self.k = min(self.k, other.k)
+        while len(self.levels) < len(other.levels):
+            self.levels.append(np.empty(0))
+        for level, items in enumerate(other.levels):
+            self.levels[level] = np.concatenate([self.levels[level], items])
+
+        self.count += other.count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self._compress()
+
+    def _compress(self):
+        self._sorted = None
+        while True:
+            level = next(
+                (idx for idx, items in enumerate(self.levels) if len(items) > self.capacity(idx)),
+                None
+            )
+            if level is None:
+                return
+            if level + 1 == len(self.levels):
+                self.levels.append(np.empty(0))
+
+            # Every other item of the sorted level moves up with twice the
+            # weight, starting at a random offset so the error stays unbiased
+            items = np.sort(self.levels[level])
+            odd = len(items) % 2
+            offset = odd + int(self.rng.integers(2))
+            self.levels[level] = items[:odd]
+            self.levels[level + 1] = np.concatenate([self.levels[level + 1], items[offset::2]])
+
+    def quantiles(self, fractions):
+        """Approximate values at the given fractions (0 to 1) of the distribution"""
+        fractions = np.asarray(fractions, dtype=np.float64)
+        if self.count == 0:
+            return np.full(fractions.shape, np.nan)
+
+        if self._sorted is None:
+            items = np.concatenate(self.levels)
+            weights = np.concatenate([
+                np.full(len(items), 2 ** level, dtype=np.int64)
+                for level, items in enumerate(self.levels)
+            ])
+            order = np.argsort(items, kind="stable")
+            self._sorted = (items[order], np.cumsum(weights[order]))
+
+        items, cumulative = self._sorted
+        positions = np.searchsorted(cumulative, fractions * cumulative[-1], side="left")
+        values = items[np.clip(positions, 0, len(items) - 1)]
+
+        # The extremes are tracked exactly
+        values = np.where(fractions <= 0, self.min, values)
+        return np.where(fractions >= 1, self.max, values)
+
+    def quantile(self, fraction):
+        return float(self.quantiles([fraction])[0])
+
+
+def column_quantile_sketches(columns, arrays, epsilon=DEFAULT_QUANTILE_ERROR, block_rows=BLOCK_ROWS):
+    """One sketch per column, each built in a single pass over its float array"""
+    sketches = {}
+    for col, values in zip(columns, arrays):
+        sketch = KLLSketch.for_error(epsilon)
+        for start in range(0, len(values), block_rows):
+            sketch.update(values[start:start + block_rows])
+        sketches[col] = sketch
+    return sketches
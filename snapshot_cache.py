@@ -0,0 +1,113 @@
+import hashlib
+import os
+import pandas as pd
+
+try:
+    import pyarrow.feather as feather
+except ImportError:
+    feather = None
+
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".stats_calc", "snapshots")
+DEFAULT_MAX_BYTES = 10 * 1024 ** 3
+SNAPSHOT_EXTENSION = ".feather"
+
+
+class SnapshotCache:
+    """Feather snapshots of parsed files, keyed by path + size + mtime"""
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+
+    @property
+    def enabled(self):
+        return feather is not None
+
+    def cache_key(self, file_path, variant=""):
+        """Key that changes whenever the source file or the load options change"""
+        stat = os.stat(file_path)
+        identity = f"{os.path.abspath(file_path)}|{stat.st_size}|{stat.st_mtime_ns}|{variant}"
+        return hashlib.sha1(identity.encode("utf-8")).hexdigest()
+
+    def snapshot_path(self, key):
+        return os.path.join(self.cache_dir, key + SNAPSHOT_EXTENSION)
+
+    def load(self, key):
+        """Return the cached DataFrame for a key, or None on a miss"""
+        if not self.enabled:
+            return None
+
+        path = self.snapshot_path(key)
+        if not os.path.exists(path):
+            return None
+
+        try:
+            table = feather.read_table(path, memory_map=True)
+            data = table.to_pandas(split_blocks=True, self_destruct=True)
+        except Exception as e:
+            print(f"Error reading snapshot {path}: {e}")
+            self._remove(path)
+            return None
+
+        # Bump the modification time so eviction is least-recently-used
+        os.utime(path)
+        return data
+
+    def store(self, key, dataframe):
+        """Write a snapshot for a key, returns True when it was written"""
+        if not self.enabled:
+            return False
+
+        # Feather needs string column names and a default index
+        if not all(isinstance(col, str) for col in dataframe.columns):
+            return False
+        if not isinstance(dataframe.index, pd.RangeIndex):
+            dataframe = dataframe.reset_index(drop=True)
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        path = self.snapshot_path(key)
+        temp_path = path + ".tmp"
+
+        try:
+            feather.write_feather(dataframe, temp_path, compression="lz4")
+            os.replace(temp_path, path)
+        except Exception as e:
+            print(f"Error writing snapshot {path}: {e}")
+            self._remove(temp_path)
+            return False
+
+        self.enforce_limit(keep=path)
+        return True
+
+    def enforce_limit(self, keep=None):
+        """Evict least recently used snapshots until the cache fits"""
+        if not os.path.isdir(self.cache_dir):
+            return
+
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith(SNAPSHOT_EXTENSION):
+                continue
+            path = os.path.join(self.cache_dir, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            if path == keep:
+                continue
+            if self._remove(path):
+                total -= size
+
+    def _remove(self, path):
+        try:
+            os.remove(path)
+            return True
+        except OSError:
+            return False
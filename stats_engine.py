@@ -0,0 +1,189 @@
+import numpy as np
+import pandas as pd
+
+
+# Rows per block when a single column is streamed
+BLOCK_ROWS = 65536
+
+# Bytes of float64 values per block when many columns are streamed together
+BLOCK_BYTES = 16 * 1024 ** 2
+
+# The accumulators of ColumnMoments, stored next to the results like any
+# other statistic so moments of appended rows can be merged in later
+SKETCH_STATISTICS = ["sketch:count", "sketch:mean", "sketch:m2", "sketch:min", "sketch:max"]
+
+
+class ColumnMoments:
+    """Mergeable count, mean, M2, min and max for a set of columns"""
+
+    def __init__(self, columns):
+        self.columns = list(columns)
+        size = len(self.columns)
+        self.count = np.zeros(size, dtype=np.int64)
+        self.mean = np.zeros(size)
+        self.m2 = np.zeros(size)
+        self.min = np.full(size, np.inf)
+        self.max = np.full(size, -np.inf)
+
+    def update(self, block):
+        """Fold in a 2D float block (rows x columns) where NaN marks missing"""
+        # The mask and the filled copy below add about twice the block's
+        # size, which is why callers bound blocks by BLOCK_BYTES
+        valid = ~np.isnan(block)
+        count = np.count_nonzero(valid, axis=0)
+        filled = np.where(valid, block, 0.0)
+
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean = np.where(count > 0, filled.sum(axis=0) / count, 0.0)
+
+        # Reuse the filled buffer for the deviations, missing entries stay 0
+        np.subtract(filled, mean, out=filled, where=valid)
+        m2 = np.einsum("ij,ij->j", filled, filled)
+
+        # fmin and fmax skip NaN without a masked copy of the block
+        minimum = np.fmin.reduce(block, axis=0, initial=np.inf)
+        maximum = np.fmax.reduce(block, axis=0, initial=-np.inf)
+
+        self._combine(count, mean, m2, minimum, maximum)
+
+    @classmethod
+    def from_sketch(cls, columns, sketch):
+        """Moments rebuilt from {sketch statistic: {column: value}}"""
+        moments = cls(columns)
+        count, mean, m2, minimum, maximum = (
+            np.array([sketch[name][col] for col in moments.columns], dtype=np.float64)
+            for name in SKETCH_STATISTICS
+        )
+        moments.count = count.astype(np.int64)
+        moments.mean = mean
+        moments.m2 = m2
+        moments.min = minimum
+        moments.max = maximum
+        return moments
+
+    def sketch(self):
+        """The accumulators as Series over the columns, keyed by sketch statistic"""
+        return {
+            name: pd.Series(values, index=self.columns)
+            for name, values in zip(
+                SKETCH_STATISTICS,
+                (self.count, self.mean, self.m2, self.min, self.max)
+            )
+        }
+
+    def merge(self, other):
+        """Fold in the moments of another chunk over the same columns"""
+        if other.columns != self.columns:
+            raise ValueError("Cannot merge moments over different columns")
+        self._combine(other.count, other.mean, other.m2, other.min, other.max)
+
+    def place(self, start, other):
+        """Copy in the moments of other, computed for the columns from start on"""
+        stop = start + len(other.columns)
+        self.count[start:stop] = other.count
+        self.mean[start:stop] = other.mean
+        self.m2[start:stop] = other.m2
+        self.min[start:stop] = other.min
+        self.max[start:stop] = other.max
+
+    def _combine(self, count, mean, m2, minimum, maximum):
+        # Pairwise update of Chan, Golub & LeVeque
+        total = self.count + count
+        delta = mean - self.mean
+
+        with np.errstate(invalid="ignore", divide="ignore"):
+            weight = np.where(total > 0, count / total, 0.0)
+            self.mean = self.mean + delta * weight
+            self.m2 = self.m2 + m2 + delta * delta * self.count * weight
+
+        self.count = total
+        self.min = np.minimum(self.min, minimum)
+        self.max = np.maximum(self.max, maximum)
+
+    def means(self):
+        return np.where(self.count > 0, self.mean, np.nan)
+
+    def variances(self, ddof=1):
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.where(self.count > ddof, self.m2 / (self.count - ddof), np.nan)
+
+    def stds(self, ddof=1):
+        return np.sqrt(self.variances(ddof))
+
+    def minimums(self):
+        return np.where(self.count > 0, self.min, np.nan)
+
+    def maximums(self):
+        return np.where(self.count > 0, self.max, np.nan)
+
+    def statistic(self, name):
+        """One of the calculation panel statistics as a Series over the columns"""
+        if name == "Mean":
+            values = self.means()
+        elif name == "Standard Deviation":
+            values = self.stds()
+        elif name == "Variance":
+            values = self.variances()
+        elif name == "Min":
+            values = self.minimums()
+        elif name == "Max":
+            values = self.maximums()
+        elif name == "Count":
+            values = self.count
+        else:
+            raise KeyError(name)
+        return pd.Series(values, index=self.columns)
+
+
+MOMENT_STATISTICS = ["Mean", "Standard Deviation", "Variance", "Min", "Max", "Count"]
+COLUMN_STATISTICS = MOMENT_STATISTICS + ["Median", "Mode"]
+
+
+def sketch_records(sketch):
+    """{column: {sketch statistic: value}} from sketch Series, the layout saved with an analysis"""
+    records = {}
+    for name in SKETCH_STATISTICS:
+        for col, value in sketch.get(name, {}).items():
+            records.setdefault(col, {})[name] = value
+    return records
+
+
+class StatisticsCache:
+    """Statistic values keyed by (dataset version, column, statistic)"""
+
+    def __init__(self):
+        self.values = {}
+
+    def missing(self, version, statistic, columns):
+        """Columns whose statistic is not cached for this version"""
+        return [col for col in columns if (version, col, statistic) not in self.values]
+
+    def series(self, version, statistic, columns):
+        return pd.Series([self.values[(version, col, statistic)] for col in columns], index=columns)
+
+    def store(self, version, statistic, values):
+        """Remember a Series of values over columns, older versions are dropped"""
+        if any(key[0] != version for key in self.values):
+            self.values = {key: value for key, value in self.values.items() if key[0] == version}
+        for col, value in values.items():
+            self.values[(version, col, statistic)] = value
+
+
+def block_rows_for(column_count, block_bytes=BLOCK_BYTES):
+    """Rows per block so a block of this many float64 columns stays within block_bytes"""
+    return max(1, block_bytes // (8 * max(column_count, 1)))
+
+
+def column_moments(columns, arrays, block_rows=None):
+    """Moments of equally long 1D float arrays, read a row block at a time"""
+    moments = ColumnMoments(columns)
+    total = len(arrays[0]) if arrays else 0
+    block_rows = block_rows or block_rows_for(len(arrays))
+
+    for start in range(0, total, block_rows):
+        # Stacked column after column, so every reduction runs over
+        # contiguous memory; the transpose is only a view
+        block = np.vstack([values[start:start + block_rows] for values in arrays]).T
+        moments.update(block)
+
+    return moments
@@ -0,0 +1,447 @@
+from PySide6.QtCore import QAbstractTableModel, QModelIndex, Qt
+from collections import OrderedDict
+import numpy as np
+import pandas as pd
+
+
+# Cells are formatted a block of rows of one column at a time
+BLOCK_ROWS = 256
+CACHE_BLOCKS = 2048
+
+# Removing more separate runs of rows than this resets the view instead
+MAX_REMOVED_RUNS = 64
+
+FLOAT_DECIMALS = 6
+MISSING_TEXT = "NaN"
+
+# Column widths are measured on the header and a sample of this many rows
+WIDTH_SAMPLE_ROWS = 96
+CELL_PADDING = 12
+
+
+def _format_floats(values):
+    # Rounding first keeps the shortest repr from printing 17 digits
+    with np.errstate(invalid="ignore"):
+        return np.round(values, FLOAT_DECIMALS).astype(str)
+
+
+def column_formatter(series):
+    """Function turning a slice of the column into display strings"""
+    dtype = series.dtype
+
+    # Plain NumPy columns format in C, nullable and text columns go
+    # through the object path below
+    is_numpy = isinstance(dtype, np.dtype)
+
+    if is_numpy and dtype.kind in "biu":
+        return lambda block: block.to_numpy().astype(str)
+
+    if is_numpy and dtype.kind == "f":
+        def format_floats(block):
+            values = block.to_numpy()
+            text = _format_floats(values)
+            text[np.isnan(values)] = MISSING_TEXT
+            return text
+        return format_floats
+
+    if pd.api.types.is_datetime64_any_dtype(dtype):
+        # Columns without a time of day are shown as plain dates
+        valid = series.dropna()
+        date_only = valid.empty or bool((valid == valid.dt.normalize()).all())
+        date_format = "%Y-%m-%d" if date_only else "%Y-%m-%d %H:%M:%S"
+
+        def format_dates(block):
+            return block.dt.strftime(date_format).fillna(MISSING_TEXT).to_numpy(dtype=object)
+        return format_dates
+
+    def format_objects(block):
+        values = block.to_numpy(dtype=object)
+        missing = pd.isna(values)
+        text = np.array(list(map(str, values)), dtype=object)
+        text[missing] = MISSING_TEXT
+        return text
+    return format_objects
+
+
+def ascending_permutation(series):
+    """Stable argsort of a column with missing values last, and the count of the rest"""
+    dtype = series.dtype
+    valid = int(series.notna().sum())
+
+    # NumPy already sorts NaN and NaT to the end
+    if isinstance(dtype, np.dtype) and dtype.kind in "biufmM":
+        return np.argsort(series.to_numpy(), kind="stable"), valid
+
+    # Everything else is ranked through its sorted distinct values
+    try:
+        codes, uniques = pd.factorize(series, sort=True)
+    except TypeError:
+        # Mixed types that do not compare, fall back to their text
+        codes, uniques = pd.factorize(series.astype(str).where(series.notna()), sort=True)
+    codes = np.where(codes < 0, len(uniques), codes)
+    return np.argsort(codes, kind="stable"), valid
+
+
+def filter_mask(dataframe, conditions):
+    """Boolean mask of the rows meeting every (column, operator, value) condition"""
+    mask = np.ones(len(dataframe), dtype=bool)
+    for column, compare, value in conditions:
+        if column not in dataframe.columns:
+            raise ValueError(f"Unknown column {column!r} in filter")
+        try:
+            matches = compare(dataframe[column], value)
+        except TypeError:
+            raise ValueError(f"Cannot compare column {column!r} with {value!r}")
+        mask &= matches.fillna(False).to_numpy(dtype=bool)
+    return mask
+
+
+def sample_rows(row_count, size=WIDTH_SAMPLE_ROWS, seed=0):
+    """Head, tail and random row positions to measure a column on"""
+    if row_count <= size:
+        return np.arange(row_count)
+    edge = size // 4
+    middle = np.random.default_rng(seed).integers(edge, row_count - edge, size - 2 * edge)
+    return np.unique(np.concatenate([
+        np.arange(edge),
+        middle,
+        np.arange(row_count - edge, row_count)
+    ]))
+
+
+def estimated_column_width(view, column, rows):
+    """Width fitting the header and the sampled cells of one column"""
+    model = view.model()
+    metrics = view.fontMetrics()
+    width = 0
+    for row in rows:
+        text = model.data(model.index(int(row), column))
+        if text is not None:
+            width = max(width, metrics.horizontalAdvance(str(text)))
+    return max(width + CELL_PADDING, view.horizontalHeader().sectionSizeHint(column))
+
+
+def fit_column_widths(view):
+    """Cheaper resizeColumnsToContents that only measures a sample of rows"""
+    rows = sample_rows(view.model().rowCount())
+    for column in range(view.model().columnCount()):
+        view.setColumnWidth(column, estimated_column_width(view, column, rows))
+
+
+class ColumnWidthCache:
+    """Sampled column widths, measured again only when a column's key changes"""
+
+    def __init__(self):
+        self.widths = {}
+
+    def fit(self, view, keys):
+        rows = None
+        widths = {}
+        for column, key in enumerate(keys):
+            if key in self.widths:
+                widths[key] = self.widths[key]
+            else:
+                if rows is None:
+                    rows = sample_rows(view.model().rowCount())
+                widths[key] = estimated_column_width(view, column, rows)
+            view.setColumnWidth(column, widths[key])
+        # Only the columns on screen are worth remembering
+        self.widths = widths
+
+
+def removal_change(removed):
+    """Change description for dropping the rows where removed is True"""
+    return {'columns': [], 'removed': np.flatnonzero(removed), 'filled': None}
+
+
+def fill_change(missing_before, dataframe):
+    """Change description for filling in some of the cells that were missing"""
+    filled = missing_before & dataframe[missing_before.columns].notna()
+    columns = [col for col in filled.columns if filled[col].any()]
+    return {'columns': columns, 'removed': [], 'filled': filled[columns]}
+
+
+def _runs(positions):
+    """Start and stop of each run of consecutive sorted positions"""
+    if len(positions) == 0:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+    breaks = np.flatnonzero(np.diff(positions) != 1) + 1
+    starts = positions[np.concatenate([[0], breaks])]
+    stops = positions[np.concatenate([breaks - 1, [len(positions) - 1]])] + 1
+    return starts, stops
+
+
+class DataFrameTableModel(QAbstractTableModel):
+    """Read-only model over a DataFrame, cells are formatted only when painted"""
+
+    def __init__(self, dataframe=None, parent=None):
+        super().__init__(parent)
+        self.dataframe = dataframe if dataframe is not None else pd.DataFrame()
+        self.version = None
+        self.formatters = {}
+        self.block_cache = OrderedDict()
+
+        # Edits made through apply_change are tracked per column and for the
+        # rows as a whole, so caches of untouched columns stay valid
+        self.edits = 0
+        self.row_version = 0
+        self.column_versions = {}
+
+        # Sorting and filtering only reorder positions, the frame is untouched
+        self.sort_column = None
+        self.sort_order = Qt.AscendingOrder
+        self.conditions = ()
+        self.permutations = {}
+        self.masks = {}
+        self.row_order = None
+        self.row_count = len(self.dataframe)
+
+    def set_dataframe(self, dataframe, version=None):
+        """Show a frame, formatted blocks of the same version stay cached"""
+        self.beginResetModel()
+        previous_columns = self.dataframe.columns
+        self.dataframe = dataframe if dataframe is not None else pd.DataFrame()
+        if version is None or version != self.version:
+            self.formatters.clear()
+            self.block_cache.clear()
+            self.permutations.clear()
+            self.masks.clear()
+        self.version = version
+        self.row_version = 0
+        self.column_versions = {}
+
+        # Sort and filter carry over while the columns stay the same
+        if not self.dataframe.columns.equals(previous_columns):
+            self.sort_column = None
+            self.conditions = ()
+        try:
+            self._update_row_order()
+        except ValueError:
+            self.conditions = ()
+            self._update_row_order()
+        self.endResetModel()
+
+    def apply_change(self, dataframe, change):
+        """Move to an edited copy of the frame, refreshing only what the change touched
+
+        change holds the 'columns' whose values changed, the 'removed' row
+        positions of the previous frame and a 'filled' mask of the cells
+        that changed, aligned with the new frame.
+        """
+        if not dataframe.columns.equals(self.dataframe.columns):
+            self.set_dataframe(dataframe)
+            return
+
+        removed = np.unique(np.asarray(change.get('removed', []), dtype=np.int64))
+        columns = [name for name in change.get('columns', []) if name in dataframe.columns]
+        filled = change.get('filled')
+
+        previous_order = self.row_order
+        keep = np.ones(len(self.dataframe), dtype=bool)
+        keep[removed] = False
+        if previous_order is None:
+            view_removed = removed
+        else:
+            view_removed = np.flatnonzero(~keep[previous_order])
+
+        for name in columns:
+            self.formatters.pop(self.column_key(name), None)
+            self.edits += 1
+            self.column_versions[name] = self.edits
+        if len(removed):
+            self._remove_cached_rows(keep, view_removed)
+
+        # Drop permutations and masks no longer reachable from the current keys
+        self.permutations = {
+            key: value for key, value in self.permutations.items()
+            if key[1] == self.row_version and key[0] == self.column_key(key[0][1])
+        }
+        self.masks = {
+            key: value for key, value in self.masks.items()
+            if key[0] == self.row_version and key[1] == self._condition_keys(key[2])
+        }
+
+        self.dataframe = dataframe
+        condition_columns = {column for column, _, _ in self.conditions}
+        reordered = self.sort_column in columns or not condition_columns.isdisjoint(columns)
+        starts, stops = _runs(view_removed)
+
+        # Many scattered removals are cheaper as one reset, the caches survive it
+        if reordered or len(starts) > MAX_REMOVED_RUNS:
+            self.beginResetModel()
+            self._update_row_order()
+            self.endResetModel()
+            return
+
+        self._update_row_order()
+        final_count = self.row_count
+        self.row_count = final_count + len(view_removed)
+        for start, stop in zip(starts[::-1], stops[::-1]):
+            self.beginRemoveRows(QModelIndex(), start, stop - 1)
+            self.row_count -= stop - start
+            self.endRemoveRows()
+
+        for name in columns:
+            column = self.dataframe.columns.get_loc(name)
+            if filled is not None and name in filled.columns:
+                changed = filled[name].to_numpy(dtype=bool)
+                if self.row_order is not None:
+                    changed = changed[self.row_order]
+                rows = np.flatnonzero(changed)
+            else:
+                rows = np.arange(self.row_count)
+            if len(rows):
+                self.dataChanged.emit(
+                    self.index(int(rows[0]), column),
+                    self.index(int(rows[-1]), column),
+                    [Qt.DisplayRole]
+                )
+
+    def _remove_cached_rows(self, keep, view_removed):
+        previous = self.row_version
+        self.edits += 1
+        self.row_version = self.edits
+        positions = np.cumsum(keep) - 1
+
+        # Sorted positions survive row removal, they only need renumbering
+        for (column_key, row_version), (ascending, valid) in list(self.permutations.items()):
+            if row_version == previous and column_key == self.column_key(column_key[1]):
+                kept = keep[ascending]
+                self.permutations[(column_key, self.row_version)] = (
+                    positions[ascending[kept]],
+                    int(kept[:valid].sum())
+                )
+        for (row_version, condition_keys, conditions), mask in list(self.masks.items()):
+            if row_version == previous and condition_keys == self._condition_keys(conditions):
+                self.masks[(self.row_version, condition_keys, conditions)] = mask[keep]
+
+        # Blocks above the first removed row still show the same cells
+        first_removed = int(view_removed[0]) if len(view_removed) else self.row_count
+        for key in list(self.block_cache):
+            column_key, row_version, order_key, block = key
+            if (row_version == previous and column_key == self.column_key(column_key[1])
+                    and (block + 1) * BLOCK_ROWS <= first_removed):
+                self.block_cache[(column_key, self.row_version, order_key, block)] = self.block_cache.pop(key)
+
+    def clear_view(self):
+        """Back to the frame's own row order"""
+        self.beginResetModel()
+        self.sort_column = None
+        self.conditions = ()
+        self._update_row_order()
+        self.endResetModel()
+
+    def sort(self, column, order=Qt.AscendingOrder):
+        """Reorder rows by a column, reusing its permutation when already computed"""
+        self.layoutAboutToBeChanged.emit()
+        self.sort_column = self.dataframe.columns[column] if 0 <= column < len(self.dataframe.columns) else None
+        self.sort_order = order
+        self._update_row_order()
+        self.layoutChanged.emit()
+
+    def set_filter(self, conditions):
+        """Only show rows meeting all conditions, raises ValueError for bad ones"""
+        conditions = tuple(conditions)
+        # Evaluate first so a bad filter leaves the current view alone
+        if conditions:
+            self._mask(conditions)
+
+        self.beginResetModel()
+        self.conditions = conditions
+        self._update_row_order()
+        self.endResetModel()
+
+    def source_row_count(self):
+        return len(self.dataframe)
+
+    def column_key(self, name):
+        """Identity of a column's content, changes whenever its values do"""
+        return (self.version, name, self.column_versions.get(name, 0))
+
+    def column_keys(self):
+        """Identity of each column's content, for caches of derived values"""
+        return [self.column_key(name) for name in self.dataframe.columns]
+
+    def _order_key(self):
+        # Includes the sorted and filtered columns' versions, editing them reorders rows
+        sort_key = None if self.sort_column is None else self.column_key(self.sort_column)
+        return (sort_key, self.sort_order, self.conditions, self._condition_keys(self.conditions))
+
+    def _condition_keys(self, conditions):
+        return tuple(self.column_key(column) for column, _, _ in conditions if column in self.dataframe.columns)
+
+    def _permutation(self, name):
+        key = (self.column_key(name), self.row_version)
+        if key not in self.permutations:
+            self.permutations[key] = ascending_permutation(self.dataframe[name])
+        return self.permutations[key]
+
+    def _mask(self, conditions):
+        key = (self.row_version, self._condition_keys(conditions), conditions)
+        if key not in self.masks:
+            self.masks[key] = filter_mask(self.dataframe, conditions)
+        return self.masks[key]
+
+    def _update_row_order(self):
+        order = None
+        if self.sort_column is not None:
+            ascending, valid = self._permutation(self.sort_column)
+            if self.sort_order == Qt.DescendingOrder:
+                # Missing values stay at the bottom either way
+                order = np.concatenate([ascending[:valid][::-1], ascending[valid:]])
+            else:
+                order = ascending
+
+        if self.conditions:
+            mask = self._mask(self.conditions)
+            order = np.flatnonzero(mask) if order is None else order[mask[order]]
+
+        self.row_order = order
+        self.row_count = len(self.dataframe) if order is None else len(order)
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self.row_count
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.dataframe.columns)
+
+    def formatted_block(self, column, block):
+        """Display strings for one block of rows of a column, cached LRU"""
+        name = self.dataframe.columns[column]
+        column_key = self.column_key(name)
+        key = (column_key, self.row_version, self._order_key(), block)
+        cached = self.block_cache.get(key)
+        if cached is not None:
+            self.block_cache.move_to_end(key)
+            return cached
+
+        series = self.dataframe.iloc[:, column]
+        if column_key not in self.formatters:
+            self.formatters[column_key] = column_formatter(series)
+
+        start = block * BLOCK_ROWS
+        if self.row_order is None:
+            rows = series.iloc[start:start + BLOCK_ROWS]
+        else:
+            rows = series.iloc[self.row_order[start:start + BLOCK_ROWS]]
+        text = self.formatters[column_key](rows)
+
+        self.block_cache[key] = text
+        if len(self.block_cache) > CACHE_BLOCKS:
+            self.block_cache.popitem(last=False)
+        return text
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or role != Qt.DisplayRole:
+            return None
+        block, offset = divmod(index.row(), BLOCK_ROWS)
+        return str(self.formatted_block(index.column(), block)[offset])
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole:
+            return None
+        if orientation == Qt.Horizontal:
+            return str(self.dataframe.columns[section])
+        if self.row_order is not None:
+            section = self.row_order[section]
+        return str(self.dataframe.index[section])